@@ -1,24 +1,139 @@
-from ast import mod
+import importlib
 import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from .chain import Chain
-from .mjcf import *
-from .sdf import *
-from .transform import *
-from .urdf import *
-try:
-    from .visualizer import *
-except ImportError:
-    pass
-
-def build_chain_from_file(filename: str, model_dir: str = "") -> Chain:
+if TYPE_CHECKING:
+    from .chain import Chain
+
+# Public names and the submodules defining them. Submodules are imported on first
+# attribute access (PEP 562), so that e.g. URDF-only users never load the MJCF
+# schema, scipy or vtk.
+_LAZY_ATTRS: Dict[str, str] = {
+    "Chain": "chain",
+    "add_composite_joint": "mjcf",
+    "body_to_link": "mjcf",
+    "build_chain_from_mjcf": "mjcf",
+    "build_serial_chain_from_mjcf": "mjcf",
+    "geoms_to_visuals": "mjcf",
+    "joint_limits": "mjcf",
+    "joint_to_frame_name": "mjcf",
+    "joint_to_joint": "mjcf",
+    "KinematicState": "state",
+    "build_chain_from_sdf": "sdf",
+    "SDF": "sdf",
+    "Box": "sdf",
+    "Cylinder": "sdf",
+    "Mesh": "sdf",
+    "Sphere": "sdf",
+    "Transform": "transform",
+    "TransformBatch": "transform",
+    "euler_from_matrix": "transform",
+    "quaternion_from_matrix": "transform",
+    "quaternion_multiply": "transform",
+    "quaternion_rotate": "transform",
+    "quaternion_to_matrix": "transform",
+    "JOINT_TYPE_MAP": "urdf",
+    "build_chain_from_urdf": "urdf",
+    "build_serial_chain_from_urdf": "urdf",
+}
+
+# Names that need the optional vtk dependency. They are not part of `__all__`.
+_VISUALIZER_ATTRS = ("Visualizer", "JointAngleEditor")
+
+_SUBMODULES = frozenset(
+    [
+        "cache",
+        "chain",
+        "compiled",
+        "dynamics",
+        "frame",
+        "ik",
+        "jacobian",
+        "mjcf",
+        "mjcf_parser",
+        "sdf",
+        "state",
+        "transform",
+        "urdf",
+        "urdf_parser_py",
+        "visualizer",
+    ]
+)
+
+__all__ = ["build_chain_from_file"] + list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module("." + _LAZY_ATTRS[name], __name__), name)
+    elif name in _VISUALIZER_ATTRS:
+        try:
+            module = importlib.import_module(".visualizer", __name__)
+        except ImportError as e:
+            raise AttributeError("module %r has no attribute %r (vtk is required)" % (__name__, name)) from e
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+def build_chain_from_file(filename: str, model_dir: str = "", cache_dir: Optional[str] = None) -> "Chain":
+    """
+    Build a Chain object from a URDF, SDF or MJCF file.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the model file.
+    model_dir : str, optional
+        Directory used to resolve MJCF includes and assets, by default ""
+    cache_dir : Optional[str], optional
+        Directory of an on-disk cache of built chains, by default None (no caching).
+        Entries are keyed by a hash of the model and the files it includes, so an
+        edited model is rebuilt and cached again automatically.
+
+    Returns
+    -------
+    Chain
+        Chain object created from the file.
+    """
     ext = os.path.splitext(filename)[-1].lower()
     data = open(filename).read()
     if ext == ".urdf" or data.lstrip().startswith("<robot"):
-        return build_chain_from_urdf(data)
+        kind = "urdf"
     elif ext == ".sdf" or data.lstrip().startswith("<sdf"):
-        return build_chain_from_sdf(data)
+        kind = "sdf"
     elif ext in (".mjcf", ".xml") or data.lstrip().startswith("<mujoco"):
-        return build_chain_from_mjcf(data, model_dir=model_dir)
+        kind = "mjcf"
     else:
         raise ValueError(f"Invalid file type: '{ext}' file.")
+    if cache_dir is not None:
+        from . import cache
+
+        key = cache.cache_key(data, kind, model_dir)
+        cached = cache.load_chain(cache_dir, key)
+        if cached is not None:
+            return cached
+    if kind == "urdf":
+        from .urdf import build_chain_from_urdf
+
+        chain = build_chain_from_urdf(data)
+    elif kind == "sdf":
+        from .sdf import build_chain_from_sdf
+
+        chain = build_chain_from_sdf(data)
+    else:
+        from .mjcf import build_chain_from_mjcf
+
+        chain = build_chain_from_mjcf(data, model_dir=model_dir)
+    if cache_dir is not None:
+        chain.compile()
+        cache.store_chain(cache_dir, key, chain)
+    return chain
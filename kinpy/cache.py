@@ -0,0 +1,114 @@
+import functools
+import hashlib
+import mmap
+import os
+import pickle
+import tempfile
+from typing import List, Optional
+
+from lxml import etree
+
+from . import chain
+
+# Sources of the package, which contain both the parsers building a chain and the classes it is pickled as.
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_SOURCE_EXTENSIONS = (".py", ".xml")
+
+
+@functools.lru_cache(maxsize=None)
+def _source_fingerprint(package_dir: str) -> str:
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if not name.endswith(_SOURCE_EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, name)
+            digest.update(os.path.relpath(path, package_dir).encode() + b"\0")
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def layout_fingerprint() -> str:
+    """Hash of the kinpy sources, i.e. the model parsers and the modules whose objects are pickled.
+
+    Any change to the package, including a new release, invalidates existing cache entries,
+    so that chains built by other parser code or pickled with another attribute layout are
+    never loaded.
+    """
+    return _source_fingerprint(_PACKAGE_DIR)
+
+
+def _mjcf_includes(data: bytes, model_dir: str) -> List[str]:
+    """Paths of the files included by an MJCF document, resolved the way the MJCF parser resolves them."""
+    try:
+        root = etree.fromstring(data)
+    except etree.XMLSyntaxError:
+        return []
+    return [os.path.join(model_dir, node.get("file", "")) for node in root.iter("include")]
+
+
+def cache_key(data: str, kind: str, model_dir: str = "") -> str:
+    """Content hash identifying a model file together with the files it includes.
+
+    Parameters
+    ----------
+    data : str
+        Model file contents.
+    kind : str
+        Model format ("urdf", "sdf" or "mjcf").
+    model_dir : str, optional
+        Directory used to resolve MJCF includes, by default ""
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(("%s:%d:%s:%s\0" % (layout_fingerprint(), pickle.HIGHEST_PROTOCOL, kind, model_dir)).encode())
+    digest.update(data.encode("utf-8"))
+    if kind != "mjcf":
+        return digest.hexdigest()
+    pending = [(data.encode("utf-8"), model_dir)]
+    seen = set()
+    while pending:
+        content, base_dir = pending.pop()
+        for path in _mjcf_includes(content, base_dir):
+            if path in seen:
+                continue
+            seen.add(path)
+            digest.update(path.encode() + b"\0")
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    included = f.read()
+                digest.update(included)
+                pending.append((included, os.path.dirname(path)))
+    return digest.hexdigest()
+
+
+def load_chain(cache_dir: str, key: str) -> Optional[chain.Chain]:
+    """Load a cached chain, or return None if there is no usable entry."""
+    path = os.path.join(cache_dir, key + ".pkl")
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            fingerprint, obj = pickle.loads(buf)
+    except (OSError, ValueError, TypeError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if fingerprint != layout_fingerprint() or not isinstance(obj, chain.Chain):
+        return None
+    return obj
+
+
+def store_chain(cache_dir: str, key: str, obj: chain.Chain) -> None:
+    """Write a chain to the cache atomically, so that concurrent readers never see a partial entry."""
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((layout_fingerprint(), obj), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, os.path.join(cache_dir, key + ".pkl"))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -1,9 +1,9 @@
 from functools import cached_property
-from typing import Dict, Iterator, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple, Union, overload
 
 import numpy as np
 
-from . import frame, ik, jacobian, transform
+from . import compiled, dynamics, frame, ik, jacobian, transform
 
 
 class Chain:
@@ -11,6 +11,10 @@ class Chain:
 
     def __init__(self, root_frame: frame.Frame) -> None:
         self._root: Optional[frame.Frame] = root_frame
+        self._frame_map: Optional[Dict[str, frame.Frame]] = None
+        self._link_map: Optional[Dict[str, frame.Link]] = None
+        self._joint_names: Optional[Dict[bool, List[str]]] = None
+        self._compiled: Optional[compiled.CompiledChain] = None
 
     def __str__(self) -> str:
         return str(self._root)
@@ -23,15 +27,28 @@ class Chain:
     def dof(self):
         return len(self.get_joint_parameter_names())
 
-    @staticmethod
-    def _find_frame_recursive(name: str, frame: frame.Frame) -> Optional[frame.Frame]:
-        for child in frame.children:
-            if child.name == name:
-                return child
-            ret = Chain._find_frame_recursive(name, child)
-            if ret is not None:
-                return ret
-        return None
+    def _build_indexes(self) -> None:
+        assert self._root is not None, "Root frame is None"
+        frame_map: Dict[str, frame.Frame] = {}
+        link_map: Dict[str, frame.Link] = {}
+        joint_names: Dict[str, None] = {}
+        movable_joint_names: Dict[str, None] = {}
+        for f in self._root.walk():
+            frame_map.setdefault(f.name, f)
+            link_map.setdefault(f.link.name, f.link)
+            joint_names[f.joint.name] = None
+            if f.joint.joint_type != "fixed":
+                movable_joint_names[f.joint.name] = None
+        self._frame_map = frame_map
+        self._link_map = link_map
+        self._joint_names = {False: list(joint_names), True: list(movable_joint_names)}
+
+    def _invalidate(self) -> None:
+        self._frame_map = None
+        self._link_map = None
+        self._joint_names = None
+        self._compiled = None
+        self.__dict__.pop("dof", None)
 
     def find_frame(self, name: str) -> Optional[frame.Frame]:
         """Find a frame by name.
@@ -46,20 +63,10 @@ class Chain:
         Optional[frame.Frame]
             Frame if found, None otherwise.
         """
-        assert self._root is not None, "Root frame is None"
-        if self._root.name == name:
-            return self._root
-        return self._find_frame_recursive(name, self._root)
-
-    @staticmethod
-    def _find_link_recursive(name: str, frame: frame.Frame) -> Optional[frame.Link]:
-        for child in frame.children:
-            if child.link.name == name:
-                return child.link
-            ret = Chain._find_link_recursive(name, child)
-            if ret is not None:
-                return ret
-        return None
+        if self._frame_map is None:
+            self._build_indexes()
+        assert self._frame_map is not None
+        return self._frame_map.get(name)
 
     def find_link(self, name: str) -> Optional[frame.Link]:
         """Find a link by name.
@@ -74,19 +81,10 @@ class Chain:
         Optional[frame.Link]
             Link if found, None otherwise.
         """
-        assert self._root is not None, "Root frame is None"
-        if self._root.link.name == name:
-            return self._root.link
-        return self._find_link_recursive(name, self._root)
-
-    @staticmethod
-    def _get_joint_parameter_names(frame: frame.Frame, exclude_fixed: bool = True) -> List[str]:
-        joint_names = []
-        if not (exclude_fixed and frame.joint.joint_type == "fixed"):
-            joint_names.append(frame.joint.name)
-        for child in frame.children:
-            joint_names.extend(Chain._get_joint_parameter_names(child, exclude_fixed))
-        return joint_names
+        if self._link_map is None:
+            self._build_indexes()
+        assert self._link_map is not None
+        return self._link_map.get(name)
 
     def get_joint_parameter_names(self, exclude_fixed: bool = True) -> List[str]:
         """Get joint parameter names.
@@ -101,29 +99,125 @@ class Chain:
         List[str]
             Joint parameter names.
         """
-        assert self._root is not None, "Root frame is None"
-        names = self._get_joint_parameter_names(self._root, exclude_fixed)
-        return list(sorted(set(names), key=names.index))
+        if self._joint_names is None:
+            self._build_indexes()
+        assert self._joint_names is not None
+        return list(self._joint_names[exclude_fixed])
+
+    def get_joint_index(self, name: str) -> int:
+        """Get the index of a joint in the joint parameter vector.
+
+        Parameters
+        ----------
+        name : str
+            Joint name.
+
+        Returns
+        -------
+        int
+            Index into `get_joint_parameter_names()`.
+        """
+        index = self.compile().joint_index.get(name)
+        if index is None:
+            raise ValueError("Invalid joint name %s." % name)
+        return index
+
+    def get_link_index(self, name: str) -> int:
+        """Get the index of a link in the arrays returned by batched kinematics.
+
+        Parameters
+        ----------
+        name : str
+            Link name.
+
+        Returns
+        -------
+        int
+            Index into `get_link_names()`.
+        """
+        index = self.compile().link_index.get(name)
+        if index is None:
+            raise ValueError("Invalid link name %s." % name)
+        return index
+
+    def get_joint_limits(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get joint position limits.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Lower and upper limits with shape (dof,), ordered as `get_joint_parameter_names()`.
+            Unlimited joints are bounded by -inf and inf.
+        """
+        comp = self.compile()
+        return comp.lower.copy(), comp.upper.copy()
+
+    def get_link_names(self) -> List[str]:
+        """Get link names in the order used by batched kinematics.
+
+        Returns
+        -------
+        List[str]
+            Link names.
+        """
+        return list(self.compile().link_names)
 
     def add_frame(self, frame: frame.Frame, parent_name: str) -> None:
+        """Add a frame as a child of a frame of the chain.
+
+        Name indexes and the compiled representation are rebuilt on next use.
+        Frames added through `frame.Frame.add_child` directly are not tracked.
+
+        Parameters
+        ----------
+        frame : frame.Frame
+            Frame to add.
+        parent_name : str
+            Name of the parent frame.
+        """
         parent_frame = self.find_frame(parent_name)
         if parent_frame is not None:
             parent_frame.add_child(frame)
+            self._invalidate()
 
-    @staticmethod
-    def _forward_kinematics(
-        root: frame.Frame, th_dict: Dict[str, float], world: Optional[transform.Transform] = None
+    def compile(self) -> compiled.CompiledChain:
+        """Get the compiled array representation of the chain.
+
+        The representation is built on first use and rebuilt after `add_frame` mutates the tree.
+
+        Returns
+        -------
+        compiled.CompiledChain
+            Compiled chain.
+        """
+        if self._compiled is None:
+            assert self._root is not None, "Root frame is None"
+            self._compiled = compiled.CompiledChain.from_root(self._root, self.get_joint_parameter_names())
+        return self._compiled
+
+    def _joint_vector(self, th: Union[Dict[str, Any], List[float], np.ndarray]) -> np.ndarray:
+        comp = self.compile()
+        if isinstance(th, dict):
+            return comp.joint_vector(th)
+        q = np.asarray(th, dtype=float)
+        assert q.shape[-1] == comp.dof
+        return q
+
+    def _link_transforms(
+        self, mats: np.ndarray, names: Optional[List[str]] = None
     ) -> Dict[str, transform.Transform]:
-        world = world or transform.Transform()
-        link_transforms = {}
-        trans = world * root.get_transform(th_dict.get(root.joint.name, 0.0))
-        link_transforms[root.link.name] = trans * root.link.offset
-        for child in root.children:
-            link_transforms.update(Chain._forward_kinematics(child, th_dict, trans))
-        return link_transforms
+        quats = transform.quaternion_from_matrix(mats)
+        return {
+            name: transform.Transform._from_arrays(rot, mat[:3, 3])
+            for name, rot, mat in zip(self.compile().link_names if names is None else names, quats, mats)
+        }
 
     def forward_kinematics(
-        self, th: Union[Dict[str, float], List[float]], world: Optional[transform.Transform] = None, **kwargs: Dict
+        self,
+        th: Union[Dict[str, float], List[float]],
+        world: Optional[transform.Transform] = None,
+        links: Optional[List[str]] = None,
+        **kwargs: Dict,
     ) -> Dict[str, transform.Transform]:
         """Forward kinematics.
 
@@ -133,21 +227,317 @@ class Chain:
             Joint parameters.
         world : Optional[transform.Transform], optional
             World transform, by default None
+        links : Optional[List[str]], optional
+            Names of the links to compute, by default all links. Only the frames
+            between the root and these links are evaluated.
 
         Returns
         -------
         Dict[str, transform.Transform]
             Link transforms.
         """
-        assert self._root is not None, "Root frame is None"
-        world = world or transform.Transform()
-        if not isinstance(th, dict):
-            jn = self.get_joint_parameter_names()
-            assert len(jn) == len(th)
-            th_dict = dict((j, th[i]) for i, j in enumerate(jn))
-        else:
-            th_dict = th
-        return self._forward_kinematics(self._root, th_dict, world)
+        q = self._joint_vector(th)
+        if links is None:
+            return self._link_transforms(self.compile().link_matrices(q, world))
+        indices = [self.get_link_index(name) for name in links]
+        return self._link_transforms(self.compile().link_matrices(q, world, indices), links)
+
+    def forward_kinematics_batch(
+        self,
+        th: Union[Dict[str, np.ndarray], np.ndarray],
+        world: Optional[transform.Transform] = None,
+        links: Optional[List[str]] = None,
+    ) -> transform.TransformBatch:
+        """Forward kinematics for a batch of joint parameters.
+
+        Parameters
+        ----------
+        th : Union[Dict[str, np.ndarray], np.ndarray]
+            Joint parameters with shape (N, dof), or a dict of joint name to values with shape (N,).
+        world : Optional[transform.Transform], optional
+            World transform, by default None
+        links : Optional[List[str]], optional
+            Names of the links to compute, by default all links.
+
+        Returns
+        -------
+        transform.TransformBatch
+            Link transforms with batch shape (N, n_links), ordered as `get_link_names()`,
+            or (N, len(links)) ordered as `links`.
+        """
+        q = np.atleast_2d(self._joint_vector(th))
+        indices = None if links is None else [self.get_link_index(name) for name in links]
+        return transform.TransformBatch.from_matrix(self.compile().link_matrices(q, world, indices))
+
+    def forward_kinematics_derivatives(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        qd: Union[Dict[str, float], List[float], np.ndarray],
+        qdd: Union[Dict[str, float], List[float], np.ndarray, None] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """Forward kinematics with link velocities and accelerations, from a single pass over the tree.
+
+        Parameters
+        ----------
+        th, qd : Union[Dict[str, float], List[float], np.ndarray]
+            Joint positions and velocities with shape (dof,) or a batch with shape (N, dof).
+        qdd : Union[Dict[str, float], List[float], np.ndarray, None], optional
+            Joint accelerations, by default None (accelerations are not computed).
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]
+            Link transforms as homogeneous matrices with shape (..., n_links, 4, 4), link twists
+            with shape (..., n_links, 6) and their time derivatives (None without `qdd`), ordered
+            as `get_link_names()`. Twists use the Jacobian layout: the world velocity of the link
+            origin followed by the angular velocity, i.e. `J(q) @ qd` for every link.
+        """
+        q, qd = self._joint_vector(th), self._joint_vector(qd)
+        return dynamics.link_motion(self.compile(), q, qd, None if qdd is None else self._joint_vector(qdd))
+
+    def link_matrices(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        world: Optional[transform.Transform] = None,
+        links: Optional[List[str]] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Forward kinematics as homogeneous matrices.
+
+        Parameters
+        ----------
+        th : Union[Dict[str, float], List[float], np.ndarray]
+            Joint parameters with shape (dof,) or (..., dof).
+        world : Optional[transform.Transform], optional
+            World transform, by default None
+        links : Optional[List[str]], optional
+            Names of the links to compute, by default all links.
+        out : Optional[np.ndarray], optional
+            Preallocated output array, by default None. With a single configuration given as a
+            float array, the call then allocates no arrays, which suits fixed-rate control loops.
+
+        Returns
+        -------
+        np.ndarray
+            Link transforms with shape (..., n_links, 4, 4) ordered as `get_link_names()`,
+            or (..., len(links), 4, 4) ordered as `links`.
+        """
+        q = self._joint_vector(th)
+        indices = None if links is None else [self.get_link_index(name) for name in links]
+        return self.compile().link_matrices(q, world, indices, out)
+
+    def jacobian(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        link_name: Union[str, List[str]],
+        tool: Optional[transform.Transform] = None,
+        return_pose: bool = False,
+    ) -> Union[np.ndarray, Tuple[np.ndarray, Union[transform.Transform, transform.TransformBatch]]]:
+        """Geometric Jacobians of links of the tree in world coordinates (linear rows first).
+
+        Parameters
+        ----------
+        th : Union[Dict[str, float], List[float], np.ndarray]
+            Joint parameters with shape (dof,) or a batch with shape (N, dof).
+        link_name : Union[str, List[str]]
+            Name of the target link, or a list of names evaluated from a single shared sweep.
+        tool : Optional[transform.Transform], optional
+            Tool transform relative to each target link, by default None
+        return_pose : bool, optional
+            Also return the poses of the target points, by default False
+
+        Returns
+        -------
+        Union[np.ndarray, Tuple[np.ndarray, Union[transform.Transform, transform.TransformBatch]]]
+            Jacobian with shape (..., 6, dof) for a single link, or (..., n_links, 6, dof) for a list.
+            Columns are ordered as `get_joint_parameter_names()`; joints that do not move a link
+            have zero columns. With `return_pose`, also the poses of the target points.
+        """
+        names = [link_name] if isinstance(link_name, str) else link_name
+        q = self._joint_vector(th)
+        jacs, poses = self.compile().link_jacobians(q, [self.get_link_index(name) for name in names], tool)
+        if isinstance(link_name, str):
+            jacs, poses = jacs[..., 0, :, :], poses[..., 0, :, :]
+        if not return_pose:
+            return jacs
+        return jacs, jacobian._pose(poses)
+
+    def inverse_dynamics(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        qd: Union[Dict[str, float], List[float], np.ndarray],
+        qdd: Union[Dict[str, float], List[float], np.ndarray],
+        gravity: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Inverse dynamics of the tree with a fixed root, by the recursive Newton-Euler algorithm.
+
+        The computation runs in O(n) on the compiled tree also used for forward kinematics.
+        Batches of configurations are evaluated together level by level.
+
+        Parameters
+        ----------
+        th, qd, qdd : Union[Dict[str, float], List[float], np.ndarray]
+            Joint positions, velocities and accelerations with shape (dof,) or a batch with
+            shape (N, dof). They are broadcast against each other.
+        gravity : Optional[np.ndarray], optional
+            Gravitational acceleration in the root frame, by default [0, 0, -9.81]
+
+        Returns
+        -------
+        np.ndarray
+            Joint torques (forces for prismatic joints) with shape (dof,) or (N, dof),
+            ordered as `get_joint_parameter_names()`.
+        """
+        q, qd, qdd = self._joint_vector(th), self._joint_vector(qd), self._joint_vector(qdd)
+        return dynamics.inverse_dynamics(self.compile(), q, qd, qdd, gravity)
+
+    def mass_matrix(self, th: Union[Dict[str, float], List[float], np.ndarray]) -> np.ndarray:
+        """Joint space inertia matrix, by the composite rigid body algorithm.
+
+        Parameters
+        ----------
+        th : Union[Dict[str, float], List[float], np.ndarray]
+            Joint positions with shape (dof,) or a batch with shape (N, dof).
+
+        Returns
+        -------
+        np.ndarray
+            Mass matrix with shape (dof, dof) or (N, dof, dof).
+        """
+        return dynamics.mass_matrix(self.compile(), self._joint_vector(th))
+
+    def gravity_torques(
+        self, th: Union[Dict[str, float], List[float], np.ndarray], gravity: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Joint torques compensating gravity, with shape (dof,) or (N, dof).
+
+        Parameters
+        ----------
+        th : Union[Dict[str, float], List[float], np.ndarray]
+            Joint positions with shape (dof,) or a batch with shape (N, dof).
+        gravity : Optional[np.ndarray], optional
+            Gravitational acceleration in the root frame, by default [0, 0, -9.81]
+        """
+        return dynamics.gravity_torques(self.compile(), self._joint_vector(th), gravity)
+
+    def bias_forces(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        qd: Union[Dict[str, float], List[float], np.ndarray],
+        gravity: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Coriolis, centrifugal and gravity torques, so that `tau = M(q) qdd + bias_forces(q, qd)`.
+
+        Parameters
+        ----------
+        th, qd : Union[Dict[str, float], List[float], np.ndarray]
+            Joint positions and velocities with shape (dof,) or a batch with shape (N, dof).
+        gravity : Optional[np.ndarray], optional
+            Gravitational acceleration in the root frame, by default [0, 0, -9.81]
+        """
+        return dynamics.bias_forces(self.compile(), self._joint_vector(th), self._joint_vector(qd), gravity)
+
+    def center_of_mass(self, th: Union[Dict[str, float], List[float], np.ndarray]) -> np.ndarray:
+        """Center of mass of the whole chain in the root frame.
+
+        Parameters
+        ----------
+        th : Union[Dict[str, float], List[float], np.ndarray]
+            Joint positions with shape (dof,) or a batch with shape (N, dof).
+
+        Returns
+        -------
+        np.ndarray
+            Center of mass with shape (3,) or (N, 3).
+        """
+        return dynamics.center_of_mass(self.compile(), self._joint_vector(th))
+
+    def com_jacobian(
+        self, th: Union[Dict[str, float], List[float], np.ndarray], return_com: bool = False
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Jacobian of the center of mass of the whole chain in the root frame.
+
+        Parameters
+        ----------
+        th : Union[Dict[str, float], List[float], np.ndarray]
+            Joint positions with shape (dof,) or a batch with shape (N, dof).
+        return_com : bool, optional
+            Also return the center of mass computed in the same pass, by default False
+
+        Returns
+        -------
+        Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+            Jacobian with shape (3, dof) or (N, 3, dof), with columns ordered as
+            `get_joint_parameter_names()`, and the center of mass if `return_com`.
+        """
+        jac, com = dynamics.com_jacobian(self.compile(), self._joint_vector(th))
+        return (jac, com) if return_com else jac
+
+    def forward_dynamics(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        qd: Union[Dict[str, float], List[float], np.ndarray],
+        tau: Union[Dict[str, float], List[float], np.ndarray],
+        gravity: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Forward dynamics of the tree with a fixed root, by the articulated body algorithm.
+
+        Parameters
+        ----------
+        th, qd, tau : Union[Dict[str, float], List[float], np.ndarray]
+            Joint positions, velocities and torques (forces for prismatic joints) with shape
+            (dof,) or a batch with shape (N, dof).
+        gravity : Optional[np.ndarray], optional
+            Gravitational acceleration in the root frame, by default [0, 0, -9.81]
+
+        Returns
+        -------
+        np.ndarray
+            Joint accelerations with shape (dof,) or (N, dof).
+        """
+        q, qd, tau = self._joint_vector(th), self._joint_vector(qd), self._joint_vector(tau)
+        return dynamics.forward_dynamics(self.compile(), q, qd, tau, gravity)
+
+    def rollout(
+        self,
+        th: Union[List[float], np.ndarray],
+        qd: Union[List[float], np.ndarray],
+        tau: np.ndarray,
+        dt: float,
+        gravity: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulate the chain with fixed steps of semi-implicit Euler integration.
+
+        Joint limits, friction and contacts are not modeled.
+
+        Parameters
+        ----------
+        th, qd : Union[List[float], np.ndarray]
+            Initial joint positions and velocities with shape (dof,), or (N, dof) for N
+            environments simulated in parallel.
+        tau : np.ndarray
+            Joint torques applied during each step with shape (T, dof) or (T, N, dof).
+        dt : float
+            Time step.
+        gravity : Optional[np.ndarray], optional
+            Gravitational acceleration in the root frame, by default [0, 0, -9.81]
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Joint positions and velocities after each step, with shape (T, dof) or (T, N, dof).
+
+        Example
+        -------
+        >>> import numpy as np
+        >>> import kinpy as kp
+        >>> chain = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf")
+        >>> q0 = np.random.uniform(-1.0, 1.0, (64, chain.dof))
+        >>> q, qd = chain.rollout(q0, np.zeros_like(q0), np.zeros((100, 64, chain.dof)), dt=0.001)
+        >>> q.shape
+        (100, 64, 7)
+        """
+        return dynamics.rollout(self.compile(), self._joint_vector(th), self._joint_vector(qd), tau, dt, gravity)
 
     @staticmethod
     def _visuals_map(root: frame.Frame) -> Dict[str, List[frame.Visual]]:
@@ -175,6 +565,10 @@ class SerialChain(Chain):
         if frames is None:
             raise ValueError("Invalid end frame name %s." % end_frame_name)
         self._serial_frames = [self._root] + frames
+        self._frame_map = None
+        self._link_map = None
+        self._joint_names = None
+        self._compiled = None
 
     @staticmethod
     def _generate_serial_chain_recurse(root_frame: frame.Frame, end_frame_name: str) -> Optional[List[frame.Frame]]:
@@ -196,6 +590,31 @@ class SerialChain(Chain):
             names.append(f.joint.name)
         return names
 
+    def compile(self) -> compiled.CompiledChain:
+        if self._compiled is None:
+            assert self._serial_frames is not None, "Serial chain not initialized."
+            joint_indices = []
+            cnt = 0
+            for f in self._serial_frames:
+                if f.joint.joint_type == "fixed":
+                    joint_indices.append(-1)
+                else:
+                    joint_indices.append(cnt)
+                    cnt += 1
+            self._compiled = compiled.CompiledChain(
+                self._serial_frames,
+                list(range(-1, len(self._serial_frames) - 1)),
+                self.get_joint_parameter_names(),
+                joint_indices,
+            )
+        return self._compiled
+
+    @cached_property
+    def _tree(self) -> Chain:
+        """The whole tree below the root frame, including the links off the serial path."""
+        assert self._root is not None, "Chain root frame is None"
+        return Chain(self._root)
+
     def forward_kinematics(  # type: ignore[override]
         self,
         th: Union[Dict[str, float], List[float]],
@@ -204,35 +623,213 @@ class SerialChain(Chain):
     ) -> Union[transform.Transform, Dict[str, transform.Transform]]:
         assert self._serial_frames is not None, "Serial chain not initialized."
         if isinstance(th, dict):
-            link_transforms = super().forward_kinematics(th, world)
+            # Joint values by name may cover the whole tree, so all its links are returned.
             if end_only:
-                return link_transforms[self._serial_frames[-1].link.name]
-            else:
-                return link_transforms
-        world = world or transform.Transform()
-        cnt = 0
-        link_transforms = {}
-        trans = world
-        for f in self._serial_frames:
-            if f.joint.joint_type != "fixed":
-                trans = trans * f.get_transform(th[cnt])
-            else:
-                trans = trans * f.get_transform()
-            link_transforms[f.link.name] = trans * f.link.offset
-            if f.joint.joint_type != "fixed":
-                cnt += 1
-        return link_transforms[self._serial_frames[-1].link.name] if end_only else link_transforms
+                end = self._serial_frames[-1].link.name
+                return self._tree.forward_kinematics(th, world, [end])[end]
+            return self._tree.forward_kinematics(th, world)
+        q = self._joint_vector(th)
+        mats = self.compile().link_matrices(q, world)
+        if end_only:
+            return transform.Transform._from_arrays(transform.quaternion_from_matrix(mats[-1]), mats[-1, :3, 3])
+        return self._link_transforms(mats)
+
+    def forward_kinematics_batch(  # type: ignore[override]
+        self,
+        th: Union[Dict[str, np.ndarray], np.ndarray],
+        world: Optional[transform.Transform] = None,
+        end_only: bool = True,
+    ) -> transform.TransformBatch:
+        """Forward kinematics for a batch of joint parameters.
 
-    def jacobian(self, th: List[float], end_only: bool = True) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        Parameters
+        ----------
+        th : Union[Dict[str, np.ndarray], np.ndarray]
+            Joint parameters with shape (N, dof), or a dict of joint name to values with shape (N,).
+        world : Optional[transform.Transform], optional
+            World transform, by default None
+        end_only : bool, optional
+            Return only the end link transforms, by default True
+
+        Returns
+        -------
+        transform.TransformBatch
+            End link transforms with batch shape (N,) if `end_only`,
+            otherwise link transforms with batch shape (N, n_links) ordered as `get_link_names()`.
+        """
+        q = np.atleast_2d(self._joint_vector(th))
+        mats = self.compile().link_matrices(q, world)
+        return transform.TransformBatch.from_matrix(mats[:, -1] if end_only else mats)
+
+    @overload
+    def jacobian(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        end_only: Literal[False],
+        tool: None = None,
+        return_pose: Literal[False] = False,
+        out: None = None,
+    ) -> Dict[str, np.ndarray]:
+        ...
+
+    @overload
+    def jacobian(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        end_only: Union[Literal[True], str, List[str]] = True,
+        tool: Optional[transform.Transform] = None,
+        return_pose: bool = False,
+        out: Optional[np.ndarray] = None,
+    ) -> Union[np.ndarray, Tuple[np.ndarray, Union[transform.Transform, transform.TransformBatch]]]:
+        ...
+
+    def jacobian(
+        self,
+        th: Union[Dict[str, float], List[float], np.ndarray],
+        end_only: Union[bool, str, List[str]] = True,
+        tool: Optional[transform.Transform] = None,
+        return_pose: bool = False,
+        out: Optional[np.ndarray] = None,
+    ) -> Union[
+        np.ndarray,
+        Dict[str, np.ndarray],
+        Tuple[np.ndarray, Union[transform.Transform, transform.TransformBatch]],
+    ]:
+        """Geometric Jacobian in world coordinates (linear rows first).
+
+        The arguments line up with `Chain.jacobian`, with `end_only` in place of `link_name`.
+
+        Parameters
+        ----------
+        th : Union[Dict[str, float], List[float], np.ndarray]
+            Joint parameters with shape (dof,) or a batch with shape (N, dof).
+        end_only : Union[bool, str, List[str]], optional
+            True for the Jacobian of the end link, False for a dict of the Jacobians of all
+            links, or the name of a link or a list of link names as in `Chain.jacobian`,
+            by default True
+        tool : Optional[transform.Transform], optional
+            Tool transform relative to the target link, by default None
+        return_pose : bool, optional
+            Also return the pose of the target point computed in the same pass, by default False
+        out : Optional[np.ndarray], optional
+            Preallocated array for the Jacobian of a single link, by default None. For a single
+            configuration the Jacobian is then computed without allocating arrays.
+
+        Returns
+        -------
+        Union[np.ndarray, Dict[str, np.ndarray], Tuple[np.ndarray, Union[Transform, TransformBatch]]]
+            Jacobian with shape (6, dof) or (N, 6, dof), a dict of link Jacobians if `end_only` is False,
+            or a tuple of the Jacobian and the pose if `return_pose`.
+
+        Raises
+        ------
+        TypeError
+            If `end_only` is neither a bool, a link name nor a list of link names.
+        ValueError
+            If `tool`, `return_pose` or `out` is given with `end_only=False`, or `out` with a list of links.
+        """
         assert self._serial_frames is not None, "Serial chain not initialized."
-        if end_only:
-            return jacobian.calc_jacobian(self, th)
-        else:
-            jacobians = {}
-            for serial_frame in self._serial_frames:
-                jac = jacobian.calc_jacobian_frames(self, th, link_name=serial_frame.link.name)
-                jacobians[serial_frame.link.name] = jac
-            return jacobians
+        q = self._joint_vector(th)
+        if isinstance(end_only, bool):
+            if end_only:
+                return jacobian.calc_jacobian(self, q, tool, return_pose, out)
+            if tool is not None or return_pose or out is not None:
+                raise ValueError("tool, return_pose and out are not supported with end_only=False.")
+            jacs = self.link_jacobians(q)
+            return dict(zip(self.get_link_names(), np.moveaxis(jacs, -3, 0)))
+        if isinstance(end_only, str):
+            return jacobian.calc_jacobian_frames(self, q, end_only, tool, return_pose, out)
+        if not isinstance(end_only, list):
+            raise TypeError("end_only must be a bool, a link name or a list of link names, not %r." % (end_only,))
+        if out is not None:
+            raise ValueError("out is not supported for a list of links.")
+        return super().jacobian(q, end_only, tool, return_pose)
+
+    def link_jacobians(self, th: Union[List[float], np.ndarray]) -> np.ndarray:
+        """Geometric Jacobians of all links, computed from a single shared sweep.
+
+        Parameters
+        ----------
+        th : Union[List[float], np.ndarray]
+            Joint parameters with shape (dof,) or a batch with shape (N, dof).
+
+        Returns
+        -------
+        np.ndarray
+            Jacobians with shape (n_links, 6, dof) or (N, n_links, 6, dof), ordered as `get_link_names()`.
+            Columns of joints after a link are zero.
+        """
+        return self.compile().link_jacobians(np.asarray(th, dtype=float))[0]
 
     def inverse_kinematics(self, pose: transform.Transform, initial_state: Optional[np.ndarray] = None) -> np.ndarray:
         return ik.inverse_kinematics(self, pose, initial_state)
+
+    def inverse_kinematics_dls(
+        self,
+        pose: transform.Transform,
+        initial_state: Optional[np.ndarray] = None,
+        tol: float = 1.0e-6,
+        max_iter: int = 100,
+        time_budget: Optional[float] = None,
+        damping: float = 1.0e-2,
+    ) -> ik.IKResult:
+        return ik.inverse_kinematics_dls(self, pose, initial_state, tol, max_iter, time_budget, damping)
+
+    def inverse_kinematics_dls_batch(
+        self,
+        poses: transform.TransformBatch,
+        initial_states: Optional[np.ndarray] = None,
+        tol: float = 1.0e-6,
+        max_iter: int = 100,
+        time_budget: Optional[float] = None,
+        damping: float = 1.0e-2,
+    ) -> ik.IKBatchResult:
+        return ik.inverse_kinematics_dls_batch(self, poses, initial_states, tol, max_iter, time_budget, damping)
+
+
+def _index_joints(link_names: List[str], joints: List[Any]) -> Tuple[str, Dict[str, List[Any]]]:
+    """Index joints by parent link and find the root link, checking that the joints form a tree.
+
+    Joints are objects with `name`, `parent` and `child` attributes, the latter two naming links.
+    """
+    child_joints: Dict[str, List[Any]] = {}
+    if len(joints) == 0:
+        if len(link_names) != 1:
+            raise ValueError("Multiple root links found: %s." % ", ".join(link_names))
+        return link_names[0], child_joints
+    parent_of: Dict[str, str] = {}
+    for j in joints:
+        if j.child in parent_of:
+            raise ValueError("Link %s has multiple parent joints." % j.child)
+        parent_of[j.child] = j.name
+        child_joints.setdefault(j.parent, []).append(j)
+    roots = [name for name in child_joints if name not in parent_of]
+    if len(roots) == 0:
+        raise ValueError("No root link found: the joints form a cycle.")
+    if len(roots) > 1:
+        raise ValueError("Multiple root links found: %s." % ", ".join(roots))
+    return roots[0], child_joints
+
+
+def _build_tree(
+    root_frame: frame.Frame,
+    child_joints: Dict[str, List[Any]],
+    n_joints: int,
+    make_frame: Callable[[frame.Frame, Any], frame.Frame],
+) -> None:
+    """Attach the frames of all joints below the root frame.
+
+    `make_frame(parent_frame, joint)` builds the child frame of a joint, whose link must be
+    named after the joint's child link.
+    """
+    n_visited = 0
+    stack = [root_frame]
+    while stack:
+        parent_frame = stack.pop()
+        for j in child_joints.get(parent_frame.link.name, []):
+            child_frame = make_frame(parent_frame, j)
+            parent_frame.children.append(child_frame)
+            stack.append(child_frame)
+            n_visited += 1
+    if n_visited != n_joints:
+        raise ValueError("Joints not reachable from the root link form a cycle.")
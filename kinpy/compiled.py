@@ -0,0 +1,491 @@
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import frame, transform
+
+JOINT_TYPE_CODES: Dict[str, int] = {"fixed": 0, "revolute": 1, "prismatic": 2}
+FIXED = JOINT_TYPE_CODES["fixed"]
+REVOLUTE = JOINT_TYPE_CODES["revolute"]
+PRISMATIC = JOINT_TYPE_CODES["prismatic"]
+
+
+def _skew(vecs: np.ndarray) -> np.ndarray:
+    mats = np.zeros(vecs.shape[:-1] + (3, 3))
+    mats[..., 0, 1] = -vecs[..., 2]
+    mats[..., 0, 2] = vecs[..., 1]
+    mats[..., 1, 0] = vecs[..., 2]
+    mats[..., 1, 2] = -vecs[..., 0]
+    mats[..., 2, 0] = -vecs[..., 1]
+    mats[..., 2, 1] = vecs[..., 0]
+    return mats
+
+
+class _JacobianWorkspace:
+    """Preallocated arrays for the Jacobian of one target frame."""
+
+    def __init__(self, comp: "CompiledChain", index: int) -> None:
+        anc = np.flatnonzero(comp.ancestors[index] & comp._movable)
+        m = len(anc)
+        self.frames = anc
+        self.columns = comp.joint_indices[anc]
+        self.unique = len(np.unique(self.columns)) == m
+        self.axes_local = comp.axes[anc]
+        self.revolute = (comp.joint_types[anc] == REVOLUTE).astype(float)
+        self.prismatic = 1.0 - self.revolute
+        self.mats = np.zeros((m, 4, 4))
+        self.axes = np.zeros((m, 3))
+        self.offsets = np.zeros((m, 3))
+        self.tmp = np.zeros((2, m))
+        self.tmp_axes = np.zeros((3, m))
+        self.cols = np.zeros((6, m))
+
+
+class _Workspace:
+    """Preallocated intermediate arrays for evaluating a single configuration without allocating."""
+
+    def __init__(self, comp: "CompiledChain") -> None:
+        n = comp.n_frames
+        self.theta = np.zeros(n)
+        self.sin = np.zeros(n)
+        self.cos = np.zeros(n)
+        self.rot = np.zeros((n, 3, 3))
+        self.rot_tmp = np.zeros((n, 3, 3))
+        self.identity = np.tile(np.identity(3), (n, 1, 1))
+        self.motion = np.zeros((n, 4, 4))
+        self.motion[:, 3, 3] = 1.0
+        self.local = np.zeros((n, 4, 4))
+        self.frames = np.zeros((n, 4, 4))
+        self.pose = np.zeros((4, 4))
+        self.tool = np.zeros((4, 4))
+        self.jacobians: Dict[int, _JacobianWorkspace] = {}
+
+
+class CompiledChain:
+    """Flat, topologically sorted array representation of a kinematic tree.
+
+    Frames are stored so that every parent comes before its children.
+    All kinematic quantities are evaluated on stacked arrays and broadcast over
+    any leading batch dimensions of the joint parameters.
+
+    Attributes
+    ----------
+    frames : List[frame.Frame]
+        Frames in topological order.
+    joint_index, link_index : Dict[str, int]
+        Joint name to joint parameter index, and link name to frame index.
+    parents : np.ndarray
+        Parent frame index of each frame (-1 for the root).
+    joint_types : np.ndarray
+        Joint type code of each frame (see `JOINT_TYPE_CODES`).
+    joint_indices : np.ndarray
+        Index into the joint parameter vector of each frame (-1 for fixed joints).
+    joint_offsets : np.ndarray
+        Joint offset matrices with shape (n_frames, 4, 4).
+    axes : np.ndarray
+        Joint axes with shape (n_frames, 3). Revolute axes are normalized.
+    link_offsets : np.ndarray
+        Link offset matrices with shape (n_frames, 4, 4).
+    lower, upper : np.ndarray
+        Joint position limits with shape (dof,) (-inf/inf for unlimited joints).
+    masses : np.ndarray
+        Link masses with shape (n_frames,).
+    coms, inertias : np.ndarray
+        Link centers of mass with shape (n_frames, 3) and inertia tensors about them with
+        shape (n_frames, 3, 3), both expressed in the coordinates of each frame (the link offsets applied).
+    levels : List[np.ndarray]
+        Frame indices grouped by depth in the tree.
+    subtree_end : np.ndarray
+        For frames in depth-first order, the subtree of frame i is the index range
+        [i, subtree_end[i]).
+    """
+
+    def __init__(
+        self,
+        frames: List[frame.Frame],
+        parents: Sequence[int],
+        joint_names: List[str],
+        joint_indices: Optional[Sequence[int]] = None,
+    ) -> None:
+        self.frames = frames
+        self.frame_names = [f.name for f in frames]
+        self.link_names = [f.link.name for f in frames]
+        self.joint_names = joint_names
+        self.joint_index = {name: i for i, name in reversed(list(enumerate(joint_names)))}
+        self.link_index = {name: i for i, name in reversed(list(enumerate(self.link_names)))}
+        self.parents = np.array(parents, dtype=int)
+        for f in frames:
+            if f.joint.joint_type not in JOINT_TYPE_CODES:
+                raise ValueError("Unsupported joint type %s." % f.joint.joint_type)
+        self.joint_types = np.array([JOINT_TYPE_CODES[f.joint.joint_type] for f in frames], dtype=int)
+        if joint_indices is None:
+            joint_indices = [-1 if f.joint.joint_type == "fixed" else self.joint_index[f.joint.name] for f in frames]
+        self.joint_indices = np.array(joint_indices, dtype=int)
+        self.joint_offsets = np.stack([f.joint.offset.matrix() for f in frames])
+        self.link_offsets = np.stack([f.link.offset.matrix() for f in frames])
+        axes = np.array([f.joint.axis for f in frames], dtype=float).reshape(-1, 3)
+        revolute = self.joint_types == REVOLUTE
+        axes[revolute] /= np.linalg.norm(axes[revolute], axis=1, keepdims=True)
+        self.axes = axes
+        self._rot_k = _skew(np.where(revolute[:, None], axes, 0.0))
+        self._rot_kk = np.matmul(self._rot_k, self._rot_k)
+        self._slide = np.where((self.joint_types == PRISMATIC)[:, None], axes, 0.0)
+        self._movable = self.joint_indices >= 0
+        self._movable_mask = self._movable.astype(float)
+        self._parent_list = self.parents.tolist()
+        self._q_index = np.maximum(self.joint_indices, 0)
+        self.lower = np.full(len(joint_names), -np.inf)
+        self.upper = np.full(len(joint_names), np.inf)
+        for f, idx in zip(frames, self.joint_indices):
+            if idx >= 0 and f.joint.limits is not None:
+                self.lower[idx] = max(self.lower[idx], f.joint.limits[0])
+                self.upper[idx] = min(self.upper[idx], f.joint.limits[1])
+        link_rot = self.link_offsets[:, :3, :3]
+        self.masses = np.array([f.link.mass for f in frames], dtype=float)
+        coms = np.array([f.link.com for f in frames], dtype=float).reshape(-1, 3)
+        self.coms = np.einsum("nij,nj->ni", link_rot, coms) + self.link_offsets[:, :3, 3]
+        inertias = np.array([f.link.inertia for f in frames], dtype=float).reshape(-1, 3, 3)
+        self.inertias = np.matmul(np.matmul(link_rot, inertias), np.swapaxes(link_rot, -1, -2))
+        depth = np.zeros(len(frames), dtype=int)
+        for i, p in enumerate(self.parents):
+            if p >= i:
+                raise ValueError("Frames are not topologically sorted.")
+            if p >= 0:
+                depth[i] = depth[p] + 1
+        self.levels = [np.flatnonzero(depth == d) for d in range(depth.max() + 1 if len(frames) > 0 else 0)]
+        self.subtree_end = np.full(len(frames), len(frames), dtype=int)
+        open_frames: List[int] = []
+        for i, d in enumerate(depth):
+            while open_frames and depth[open_frames[-1]] >= d:
+                self.subtree_end[open_frames.pop()] = i
+            open_frames.append(i)
+        self._depth = depth
+        self._is_path = bool(np.array_equal(self.parents, np.arange(-1, len(frames) - 1)))
+        self._ancestors: Optional[np.ndarray] = None
+        self._ancestor_weights: Optional[np.ndarray] = None
+        self._subsets: Dict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray, List[np.ndarray], np.ndarray]] = {}
+        self._tls = threading.local()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_tls"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._tls = threading.local()
+
+    def _workspace(self) -> _Workspace:
+        """Per-thread preallocated arrays used by the `out=` code paths."""
+        ws = getattr(self._tls, "workspace", None)
+        if ws is None:
+            ws = self._tls.workspace = _Workspace(self)
+        return ws
+
+    @classmethod
+    def from_root(cls, root: frame.Frame, joint_names: List[str]) -> "CompiledChain":
+        """Compile the tree below a root frame in depth-first order.
+
+        Parameters
+        ----------
+        root : frame.Frame
+            Root frame.
+        joint_names : List[str]
+            Joint parameter names defining the layout of the joint vector.
+
+        Returns
+        -------
+        CompiledChain
+            Compiled chain.
+        """
+        frames: List[frame.Frame] = []
+        parents: List[int] = []
+        stack = [(root, -1)]
+        while stack:
+            f, p = stack.pop()
+            parents.append(p)
+            frames.append(f)
+            idx = len(frames) - 1
+            stack.extend((c, idx) for c in reversed(f.children))
+        return cls(frames, parents, joint_names)
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.frames)
+
+    @property
+    def dof(self) -> int:
+        return len(self.joint_names)
+
+    def joint_vector(self, th: Dict[str, Any]) -> np.ndarray:
+        """Convert a joint name dictionary into a joint parameter vector (missing joints are 0)."""
+        values = [np.asarray(th.get(name, 0.0), dtype=float) for name in self.joint_names]
+        if len(values) == 0:
+            return np.zeros(0)
+        return np.stack(np.broadcast_arrays(*values), axis=-1)
+
+    def frame_values(self, q: np.ndarray) -> np.ndarray:
+        """Gather the joint value of every frame with shape (..., n_frames)."""
+        q = np.asarray(q, dtype=float)
+        theta = np.zeros(q.shape[:-1] + (self.n_frames,))
+        theta[..., self._movable] = q[..., self.joint_indices[self._movable]]
+        return theta
+
+    def local_matrices(self, q: np.ndarray, indices: Union[Sequence[int], np.ndarray, None] = None) -> np.ndarray:
+        """Frame transforms relative to their parent frames with shape (..., n_frames, 4, 4).
+
+        If `indices` is given, only those frames are evaluated.
+        """
+        sel = slice(None) if indices is None else np.asarray(indices, dtype=int)
+        theta = self.frame_values(q)[..., sel]
+        s = np.sin(theta)[..., None, None]
+        c = np.cos(theta)[..., None, None]
+        motion = np.zeros(theta.shape + (4, 4))
+        motion[..., :3, :3] = s * self._rot_k[sel] + (1.0 - c) * self._rot_kk[sel]
+        motion[..., :3, :3] += np.identity(3)
+        motion[..., :3, 3] = theta[..., None] * self._slide[sel]
+        motion[..., 3, 3] = 1.0
+        return np.matmul(self.joint_offsets[sel], motion)
+
+    @staticmethod
+    def _sweep(
+        local: np.ndarray, parents: np.ndarray, levels: List[np.ndarray], world: Optional[transform.Transform]
+    ) -> np.ndarray:
+        mats = np.empty_like(local)
+        if local.ndim == 3:
+            for i, p in enumerate(parents.tolist()):
+                if p >= 0:
+                    mats[i] = np.dot(mats[p], local[i])
+                else:
+                    mats[i] = local[i] if world is None else np.dot(world.matrix(), local[i])
+            return mats
+        root = levels[0]
+        mats[..., root, :, :] = local[..., root, :, :]
+        if world is not None:
+            mats[..., root, :, :] = np.matmul(world.matrix(), mats[..., root, :, :])
+        for level in levels[1:]:
+            mats[..., level, :, :] = np.matmul(mats[..., parents[level], :, :], local[..., level, :, :])
+        return mats
+
+    def frame_matrices(self, q: np.ndarray, world: Optional[transform.Transform] = None) -> np.ndarray:
+        """World transforms of every frame with shape (..., n_frames, 4, 4)."""
+        return self._sweep(self.local_matrices(q), self.parents, self.levels, world)
+
+    def _frame_matrices_into(self, q: np.ndarray, world: Optional[transform.Transform]) -> np.ndarray:
+        """`frame_matrices` for a single configuration, evaluated in the thread's workspace."""
+        ws = self._workspace()
+        if self.dof > 0:
+            np.take(q, self._q_index, out=ws.theta, mode="clip")
+            ws.theta *= self._movable_mask
+        np.sin(ws.theta, out=ws.sin)
+        np.cos(ws.theta, out=ws.cos)
+        np.subtract(1.0, ws.cos, out=ws.cos)
+        # einsum and same-shape operands avoid the temporary buffers of broadcasting ufuncs.
+        np.einsum("i,ijk->ijk", ws.sin, self._rot_k, out=ws.rot)
+        np.einsum("i,ijk->ijk", ws.cos, self._rot_kk, out=ws.rot_tmp)
+        ws.rot += ws.rot_tmp
+        ws.rot += ws.identity
+        ws.motion[:, :3, :3] = ws.rot
+        np.einsum("i,ij->ij", ws.theta, self._slide, out=ws.motion[:, :3, 3])
+        np.matmul(self.joint_offsets, ws.motion, out=ws.local)
+        mats = ws.frames
+        for i, p in enumerate(self._parent_list):
+            if p >= 0:
+                np.dot(mats[p], ws.local[i], out=mats[i])
+            elif world is None:
+                mats[i] = ws.local[i]
+            else:
+                np.dot(world.matrix(), ws.local[i], out=mats[i])
+        return mats
+
+    def _subset(self, indices: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray], np.ndarray]:
+        """Frames needed to reach some target frames, with parents and levels renumbered within the subset."""
+        key = tuple(int(i) for i in indices)
+        subset = self._subsets.get(key)
+        if subset is None:
+            targets = np.array(key, dtype=int)
+            frames = np.flatnonzero(self.ancestors[targets].any(axis=0))
+            position = np.full(self.n_frames, -1, dtype=int)
+            position[frames] = np.arange(len(frames))
+            parents = self.parents[frames]
+            parents = np.where(parents >= 0, position[parents], -1)
+            depth = self._depth[frames]
+            levels = [np.flatnonzero(depth == d) for d in np.unique(depth)]
+            subset = (frames, parents, levels, position[targets])
+            self._subsets[key] = subset
+        return subset
+
+    def link_matrices(
+        self,
+        q: np.ndarray,
+        world: Optional[transform.Transform] = None,
+        indices: Optional[Sequence[int]] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """World transforms of links with shape (..., n_frames, 4, 4).
+
+        If `indices` is given, only the frames on the paths from the root to those links are
+        evaluated and the result has shape (..., len(indices), 4, 4).
+        If `out` is given, the result is written to it. For a single configuration no other
+        arrays are allocated either, which keeps the garbage collector quiet in control loops.
+        """
+        if out is not None:
+            if q.ndim == 1:
+                frames = self._frame_matrices_into(q, world)
+                if indices is None:
+                    return np.matmul(frames, self.link_offsets, out=out)
+                for k, i in enumerate(indices):
+                    np.matmul(frames[i], self.link_offsets[i], out=out[k])
+                return out
+            out[...] = self.link_matrices(q, world, indices)
+            return out
+        if indices is None:
+            return np.matmul(self.frame_matrices(q, world), self.link_offsets)
+        frames, parents, levels, targets = self._subset(indices)
+        mats = self._sweep(self.local_matrices(q, frames), parents, levels, world)
+        return np.matmul(mats[..., targets, :, :], self.link_offsets[frames[targets]])
+
+    @property
+    def ancestors(self) -> np.ndarray:
+        """Boolean matrix whose entry (i, j) is True if frame j is frame i or one of its ancestors."""
+        if self._ancestors is None:
+            anc = np.zeros((self.n_frames, self.n_frames), dtype=bool)
+            for i, p in enumerate(self.parents):
+                if p >= 0:
+                    anc[i] = anc[p]
+                anc[i, i] = True
+            self._ancestors = anc
+        return self._ancestors
+
+    @property
+    def ancestor_weights(self) -> np.ndarray:
+        """`ancestors` as a float matrix, for summing values along tree paths with matrix products."""
+        if self._ancestor_weights is None:
+            self._ancestor_weights = self.ancestors.astype(float)
+        return self._ancestor_weights
+
+    def link_jacobians(
+        self, q: np.ndarray, indices: Optional[Sequence[int]] = None, tool: Optional[transform.Transform] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Geometric Jacobians of several links in world coordinates, computed from a single forward sweep.
+
+        Parameters
+        ----------
+        q : np.ndarray
+            Joint parameters with shape (..., dof).
+        indices : Optional[Sequence[int]], optional
+            Frame indices of the target links, by default all frames.
+        tool : Optional[transform.Transform], optional
+            Tool transform relative to each target link, by default None
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Jacobians with shape (..., n_targets, 6, dof) (linear rows first; columns of joints
+            that do not move a target are zero) and the poses of the target points as
+            homogeneous matrices with shape (..., n_targets, 4, 4).
+        """
+        if indices is None:
+            targets = np.arange(self.n_frames)
+            subset, positions, mats = targets, targets, self.frame_matrices(q)
+        else:
+            targets = np.asarray(indices, dtype=int)
+            # Only the frames between the root and the targets are evaluated.
+            subset, parents, levels, positions = self._subset(indices)
+            mats = self._sweep(self.local_matrices(q, subset), parents, levels, None)
+        poses = np.matmul(mats[..., positions, :, :], self.link_offsets[targets])
+        if tool is not None:
+            poses = np.matmul(poses, tool.matrix())
+        mask = self.ancestors[targets][:, subset]
+        movable_positions = np.flatnonzero(self._movable[subset] & mask.any(axis=0))
+        movable = subset[movable_positions]
+        mask = mask[:, movable_positions]
+        frames = mats[..., movable_positions, :, :]
+        axes = np.einsum("...ij,...j->...i", frames[..., :3, :3], self.axes[movable])
+        revolute = (self.joint_types[movable] == REVOLUTE)[:, None]
+        offsets = poses[..., :, None, :3, 3] - frames[..., None, :, :3, 3]
+        cols = np.zeros(offsets.shape[:-1] + (6,))
+        cols[..., :3] = np.where(revolute, np.cross(axes[..., None, :, :], offsets), axes[..., None, :, :])
+        cols[..., 3:] = np.where(revolute, axes, 0.0)[..., None, :, :]
+        cols *= mask[..., None]
+        select = np.zeros((len(movable), self.dof))
+        select[np.arange(len(movable)), self.joint_indices[movable]] = 1.0
+        return np.einsum("...tmk,md->...tkd", cols, select), poses
+
+    def _jacobian_into(
+        self, q: np.ndarray, index: int, tool: Optional[transform.Transform], out: np.ndarray, pose_out: np.ndarray
+    ) -> None:
+        frames = self._frame_matrices_into(q, None)
+        ws = self._workspace()
+        jw = ws.jacobians.get(index)
+        if jw is None:
+            jw = ws.jacobians[index] = _JacobianWorkspace(self, index)
+        np.matmul(frames[index], self.link_offsets[index], out=pose_out)
+        if tool is not None:
+            np.matmul(pose_out, tool.matrix(), out=ws.tool)
+            pose_out[...] = ws.tool
+        np.take(frames, jw.frames, axis=0, out=jw.mats)
+        np.einsum("mij,mj->mi", jw.mats[:, :3, :3], jw.axes_local, out=jw.axes)
+        np.subtract(pose_out[:3, 3], jw.mats[:, :3, 3], out=jw.offsets)
+        a, d, cols = jw.axes, jw.offsets, jw.cols
+        for r, i, j in ((0, 1, 2), (1, 2, 0), (2, 0, 1)):
+            np.multiply(a[:, i], d[:, j], out=jw.tmp[0])
+            np.multiply(a[:, j], d[:, i], out=jw.tmp[1])
+            np.subtract(jw.tmp[0], jw.tmp[1], out=cols[r])
+        cols[:3] *= jw.revolute
+        np.multiply(a.T, jw.prismatic, out=jw.tmp_axes)
+        cols[:3] += jw.tmp_axes
+        np.multiply(a.T, jw.revolute, out=cols[3:])
+        out.fill(0.0)
+        if jw.unique:
+            out[:, jw.columns] = cols
+        else:
+            np.add.at(out.T, jw.columns, cols.T)
+
+    def jacobian(
+        self,
+        q: np.ndarray,
+        index: int,
+        tool: Optional[transform.Transform] = None,
+        out: Optional[np.ndarray] = None,
+        pose_out: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Geometric Jacobian of a link in world coordinates, computed from a single forward sweep.
+
+        Parameters
+        ----------
+        q : np.ndarray
+            Joint parameters with shape (..., dof).
+        index : int
+            Frame index of the target link.
+        tool : Optional[transform.Transform], optional
+            Tool transform relative to the target link, by default None
+        out : Optional[np.ndarray], optional
+            Preallocated array for the Jacobian, by default None
+        pose_out : Optional[np.ndarray], optional
+            Preallocated array for the pose, by default None
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Jacobian with shape (..., 6, dof) (linear rows first) and the pose of the
+            target point as a homogeneous matrix with shape (..., 4, 4).
+            They are written to `out` and `pose_out` if given; for a single configuration
+            the computation then allocates no arrays. In that case, without `pose_out` the
+            pose is a per-thread buffer that the next call overwrites.
+        """
+        if out is not None and q.ndim == 1:
+            if pose_out is None:
+                pose_out = self._workspace().pose
+            self._jacobian_into(q, index, tool, out, pose_out)
+            return out, pose_out
+        jacs, poses = self.link_jacobians(q, [index], tool)
+        jac, pose = jacs[..., 0, :, :], poses[..., 0, :, :]
+        if out is not None:
+            out[...] = jac
+            jac = out
+        if pose_out is not None:
+            pose_out[...] = pose
+            pose = pose_out
+        return jac, pose
@@ -0,0 +1,502 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from . import compiled
+
+# Gravitational acceleration in the coordinates of the root frame.
+GRAVITY = np.array([0.0, 0.0, -9.81])
+
+
+# Index permutations of the cross product components.
+_NEXT = np.array([1, 2, 0])
+_PREV = np.array([2, 0, 1])
+
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Cross product over the last axis, much cheaper than `np.cross` for the arrays used here."""
+    if a.size < 3000:
+        # Few large operations: the per-call overhead dominates for small arrays.
+        return a.take(_NEXT, -1) * b.take(_PREV, -1) - a.take(_PREV, -1) * b.take(_NEXT, -1)
+    a0, a1, a2 = a[..., 0], a[..., 1], a[..., 2]
+    b0, b1, b2 = b[..., 0], b[..., 1], b[..., 2]
+    return np.stack([a1 * b2 - a2 * b1, a2 * b0 - a0 * b2, a0 * b1 - a1 * b0], axis=-1)
+
+
+def _cross_motion(v: np.ndarray, m: np.ndarray) -> np.ndarray:
+    """Spatial cross product of motion vectors with shape (..., 6)."""
+    return np.concatenate(
+        [_cross(v[..., :3], m[..., :3]), _cross(v[..., :3], m[..., 3:]) + _cross(v[..., 3:], m[..., :3])], axis=-1
+    )
+
+
+def _cross_force(v: np.ndarray, f: np.ndarray) -> np.ndarray:
+    """Spatial cross product of a motion vector and a force vector with shape (..., 6)."""
+    return np.concatenate(
+        [_cross(v[..., :3], f[..., :3]) + _cross(v[..., 3:], f[..., 3:]), _cross(v[..., :3], f[..., 3:])], axis=-1
+    )
+
+
+def _flatten(comp: compiled.CompiledChain, *vectors: np.ndarray) -> Tuple[Tuple[int, ...], List[np.ndarray]]:
+    """Broadcast joint vectors against each other and flatten their batch dimensions into one."""
+    arrays = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in vectors])
+    assert arrays[0].shape[-1] == comp.dof
+    return arrays[0].shape[:-1], [a.reshape(-1, comp.dof) for a in arrays]
+
+
+def _frame_poses(comp: compiled.CompiledChain, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """World rotations (n, B, 3, 3), origins (n, B, 3) and joint axes (n, B, 3) of the frames.
+
+    `frames` are the frame matrices with shape (B, n, 4, 4). The frame index is moved first
+    so that whole tree levels can be indexed at once.
+    """
+    mats = np.moveaxis(frames, -3, 0)
+    rot = mats[..., :3, :3]
+    axes = np.einsum("nbij,nj->nbi", rot, comp.axes)
+    return rot, mats[..., :3, 3], axes
+
+
+# Up to this many frames, sums over tree paths are done as one product with the dense
+# ancestor matrix, which is much faster than a loop over the tree levels.
+_DENSE_FRAMES = 128
+
+
+def _prefix_sums(comp: compiled.CompiledChain, values: np.ndarray) -> np.ndarray:
+    """Sum per-frame values with shape (n, ...) over the path from the root to each frame."""
+    if comp._is_path:
+        return np.cumsum(values, axis=0)
+    if comp.n_frames <= _DENSE_FRAMES:
+        return np.matmul(comp.ancestor_weights, values.reshape(comp.n_frames, -1)).reshape(values.shape)
+    sums = values.copy()
+    for level in comp.levels[1:]:
+        sums[level] += sums[comp.parents[level]]
+    return sums
+
+
+def _subtree_sums(comp: compiled.CompiledChain, values: np.ndarray) -> np.ndarray:
+    """Sum per-frame values with shape (n, ...) over the subtree of each frame."""
+    if comp._is_path:
+        return np.cumsum(values[::-1], axis=0)[::-1]
+    if comp.n_frames <= _DENSE_FRAMES:
+        return np.matmul(comp.ancestor_weights.T, values.reshape(comp.n_frames, -1)).reshape(values.shape)
+    sums = values.copy()
+    for level in reversed(comp.levels[1:]):
+        np.add.at(sums, comp.parents[level], sums[level])
+    return sums
+
+
+def _parent_values(comp: compiled.CompiledChain, values: np.ndarray) -> np.ndarray:
+    """Values of the parent of each frame, zero for root frames."""
+    parent = values[comp.parents]
+    parent[comp.parents < 0] = 0.0
+    return parent
+
+
+def _motion(
+    comp: compiled.CompiledChain,
+    pos: np.ndarray,
+    axes: np.ndarray,
+    qd: np.ndarray,
+    qdd: np.ndarray,
+    base_acc: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Propagate velocities and accelerations from the root to the leaves.
+
+    Every joint adds its own contribution to the motion of its parent, so each quantity is
+    a sum over the path from the root, evaluated one tree level at a time (a cumulative
+    sum for serial chains).
+
+    Returns the angular velocities, linear velocities, angular accelerations and linear
+    accelerations of the frame origins in world coordinates, each with shape (n, B, 3).
+    """
+    revolute = (comp.joint_types == compiled.REVOLUTE)[:, None, None]
+    prismatic = (comp.joint_types == compiled.PRISMATIC)[:, None, None]
+    rate = axes * comp.frame_values(qd).T[..., None]
+    joint_acc = axes * comp.frame_values(qdd).T[..., None]
+    spin = np.where(revolute, rate, 0.0)
+    omega = _prefix_sums(comp, spin)
+    w = _parent_values(comp, omega)
+    r = pos - _parent_values(comp, pos)
+    vel = _prefix_sums(comp, _cross(w, r) + np.where(prismatic, rate, 0.0))
+    alpha = _prefix_sums(comp, np.where(revolute, joint_acc, 0.0) + _cross(w, spin))
+    acc = _prefix_sums(
+        comp,
+        _cross(_parent_values(comp, alpha), r)
+        + _cross(w, _cross(w, r))
+        + np.where(prismatic, joint_acc + 2.0 * _cross(w, rate), 0.0),
+    )
+    acc += base_acc
+    return omega, vel, alpha, acc
+
+
+def _link_wrenches(
+    comp: compiled.CompiledChain, rot: np.ndarray, omega: np.ndarray, alpha: np.ndarray, acc: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Newton-Euler forces and moments (about the frame origins) needed to move each link, shape (n, B, 3)."""
+    lever = np.einsum("nbij,nj->nbi", rot, comp.coms)
+    acc_com = acc + _cross(alpha, lever) + _cross(omega, _cross(omega, lever))
+    forces = comp.masses[:, None, None] * acc_com
+    inertia = np.matmul(np.matmul(rot, comp.inertias[:, None]), np.swapaxes(rot, -1, -2))
+    moments = (
+        np.einsum("nbij,nbj->nbi", inertia, alpha)
+        + _cross(omega, np.einsum("nbij,nbj->nbi", inertia, omega))
+        + _cross(lever, forces)
+    )
+    return forces, moments
+
+
+def _spatial_inertias(comp: compiled.CompiledChain, rot: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    """Spatial inertias of the links about the world origin with shape (n, B, 6, 6).
+
+    Spatial vectors are in world coordinates with the angular part first: motions are
+    (angular velocity, velocity of the point at the world origin) and forces are
+    (moment about the world origin, force).
+    """
+    com = pos + np.einsum("nbij,nj->nbi", rot, comp.coms)
+    mass = comp.masses[:, None, None, None]
+    inertia = np.zeros(com.shape[:-1] + (6, 6))
+    inertia[..., :3, :3] = np.matmul(np.matmul(rot, comp.inertias[:, None]), np.swapaxes(rot, -1, -2))
+    inertia[..., :3, :3] += mass * (
+        np.einsum("nbi,nbi->nb", com, com)[..., None, None] * np.identity(3) - com[..., :, None] * com[..., None, :]
+    )
+    moment = compiled._skew(mass[..., 0] * com)
+    inertia[..., :3, 3:] = moment
+    inertia[..., 3:, :3] = -moment
+    inertia[..., 3:, 3:] = mass * np.identity(3)
+    return inertia
+
+
+def _joint_motions(comp: compiled.CompiledChain, pos: np.ndarray, axes: np.ndarray) -> np.ndarray:
+    """Spatial motion of each frame per unit joint velocity with shape (n, B, 6), zero for fixed joints."""
+    revolute = (comp.joint_types == compiled.REVOLUTE)[:, None, None]
+    prismatic = (comp.joint_types == compiled.PRISMATIC)[:, None, None]
+    motion = np.zeros(axes.shape[:-1] + (6,))
+    motion[..., :3] = np.where(revolute, axes, 0.0)
+    motion[..., 3:] = np.where(revolute, _cross(pos, axes), np.where(prismatic, axes, 0.0))
+    return motion
+
+
+def _joint_forces(
+    comp: compiled.CompiledChain, pos: np.ndarray, axes: np.ndarray, forces: np.ndarray, moments: np.ndarray
+) -> np.ndarray:
+    """Accumulate link wrenches from the leaves to the root and project them onto the joint axes.
+
+    Returns joint forces and torques with shape (B, dof).
+    """
+    # Moments about the world origin add up directly over subtrees.
+    sums = _subtree_sums(comp, np.concatenate([forces, moments + _cross(pos, forces)], axis=-1))
+    f = sums[..., :3]
+    m = sums[..., 3:] - _cross(pos, f)
+    revolute = (comp.joint_types == compiled.REVOLUTE)[:, None]
+    tau_frames = np.where(revolute, np.sum(axes * m, axis=-1), np.sum(axes * f, axis=-1))
+    tau = np.zeros((comp.dof, forces.shape[1]))
+    movable = comp._movable
+    np.add.at(tau, comp.joint_indices[movable], tau_frames[movable])
+    return tau.T
+
+
+def inverse_dynamics(
+    comp: compiled.CompiledChain,
+    q: np.ndarray,
+    qd: np.ndarray,
+    qdd: np.ndarray,
+    gravity: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Joint forces and torques producing given joint accelerations, by the recursive Newton-Euler algorithm.
+
+    The tree has a fixed base at its root frame. Velocities and accelerations are propagated
+    from the root to the leaves and link wrenches back to the root, both a tree level at a
+    time, so the cost is O(n) and every level is evaluated for the whole batch at once.
+
+    Parameters
+    ----------
+    comp : compiled.CompiledChain
+        Compiled chain.
+    q, qd, qdd : np.ndarray
+        Joint positions, velocities and accelerations with shape (..., dof). They are broadcast
+        against each other.
+    gravity : Optional[np.ndarray], optional
+        Gravitational acceleration in root frame coordinates, by default `GRAVITY`
+
+    Returns
+    -------
+    np.ndarray
+        Joint forces (prismatic joints) and torques (revolute joints) with shape (..., dof).
+    """
+    shape, (q, qd, qdd) = _flatten(comp, q, qd, qdd)
+    rot, pos, axes = _frame_poses(comp, comp.frame_matrices(q))
+    g = GRAVITY if gravity is None else np.asarray(gravity, dtype=float)
+    omega, _, alpha, acc = _motion(comp, pos, axes, qd, qdd, -g)
+    forces, moments = _link_wrenches(comp, rot, omega, alpha, acc)
+    return _joint_forces(comp, pos, axes, forces, moments).reshape(shape + (comp.dof,))
+
+
+def mass_matrix(comp: compiled.CompiledChain, q: np.ndarray) -> np.ndarray:
+    """Joint space inertia matrix by the composite rigid body algorithm.
+
+    The inertias of all subtrees are accumulated in one leaves-to-root pass, after which
+    entry (i, j) is the work done by the motion of joint j against the composite inertia
+    moved by joint i. Only pairs of joints on a common path are nonzero, and the cost is
+    O(n^2) at most.
+
+    Parameters
+    ----------
+    comp : compiled.CompiledChain
+        Compiled chain.
+    q : np.ndarray
+        Joint positions with shape (..., dof).
+
+    Returns
+    -------
+    np.ndarray
+        Symmetric positive semi-definite matrix with shape (..., dof, dof).
+    """
+    shape, (q,) = _flatten(comp, q)
+    rot, pos, axes = _frame_poses(comp, comp.frame_matrices(q))
+    movable = np.flatnonzero(comp._movable)
+    composite = _subtree_sums(comp, _spatial_inertias(comp, rot, pos))[movable]
+    motion = _joint_motions(comp, pos, axes)[movable]
+    # Momentum of the subtree below each joint when only that joint moves, paired with the other joints.
+    momentum = np.einsum("mbij,mbj->mbi", composite, motion)
+    lower = np.einsum("ibk,jbk->bij", momentum, motion)
+    lower *= comp.ancestors[np.ix_(movable, movable)]
+    full = lower + np.swapaxes(lower, -1, -2)
+    diag = np.arange(len(movable))
+    full[:, diag, diag] = lower[:, diag, diag]
+    select = np.zeros((len(movable), comp.dof))
+    select[np.arange(len(movable)), comp.joint_indices[movable]] = 1.0
+    return np.matmul(np.matmul(select.T, full), select).reshape(shape + (comp.dof, comp.dof))
+
+
+def _subtree_moments(
+    comp: compiled.CompiledChain, q: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Masses (n, B) and first moments (n, B, 3) of the subtrees, with the frame origins and joint axes."""
+    rot, pos, axes = _frame_poses(comp, comp.frame_matrices(q))
+    mass = comp.masses[:, None, None]
+    moment = mass * (pos + np.einsum("nbij,nj->nbi", rot, comp.coms))
+    sums = _subtree_sums(comp, np.concatenate([np.broadcast_to(mass, moment.shape[:-1] + (1,)), moment], axis=-1))
+    return sums[..., 0], sums[..., 1:], pos, axes
+
+
+def _total_mass(comp: compiled.CompiledChain) -> float:
+    total = float(comp.masses.sum())
+    if total <= 0.0:
+        raise ValueError("The chain has no mass.")
+    return total
+
+
+def center_of_mass(comp: compiled.CompiledChain, q: np.ndarray) -> np.ndarray:
+    """Center of mass of the whole tree in root frame coordinates with shape (..., 3)."""
+    total = _total_mass(comp)
+    shape, (q,) = _flatten(comp, q)
+    _, moment, _, _ = _subtree_moments(comp, q)
+    return (moment[comp.levels[0]].sum(axis=0) / total).reshape(shape + (3,))
+
+
+def com_jacobian(comp: compiled.CompiledChain, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Jacobian of the center of mass of the whole tree, evaluated from a single forward sweep.
+
+    A joint moves the center of mass through the subtree below it only, so each column
+    follows from the mass and first moment of that subtree, which are accumulated for all
+    joints in one leaves-to-root pass.
+
+    Parameters
+    ----------
+    comp : compiled.CompiledChain
+        Compiled chain.
+    q : np.ndarray
+        Joint positions with shape (..., dof).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Jacobian with shape (..., 3, dof) and the center of mass with shape (..., 3), in
+        root frame coordinates.
+    """
+    total = _total_mass(comp)
+    shape, (q,) = _flatten(comp, q)
+    mass, moment, pos, axes = _subtree_moments(comp, q)
+    movable = np.flatnonzero(comp._movable)
+    revolute = (comp.joint_types[movable] == compiled.REVOLUTE)[:, None, None]
+    z = axes[movable]
+    lever = moment[movable] - mass[movable][..., None] * pos[movable]
+    cols = np.where(revolute, _cross(z, lever), z * mass[movable][..., None]) / total
+    select = np.zeros((len(movable), comp.dof))
+    select[np.arange(len(movable)), comp.joint_indices[movable]] = 1.0
+    jac = np.einsum("mbk,md->bkd", cols, select).reshape(shape + (3, comp.dof))
+    return jac, (moment[comp.levels[0]].sum(axis=0) / total).reshape(shape + (3,))
+
+
+def gravity_torques(comp: compiled.CompiledChain, q: np.ndarray, gravity: Optional[np.ndarray] = None) -> np.ndarray:
+    """Joint torques balancing gravity with shape (..., dof)."""
+    return inverse_dynamics(comp, q, np.zeros(comp.dof), np.zeros(comp.dof), gravity)
+
+
+def bias_forces(
+    comp: compiled.CompiledChain, q: np.ndarray, qd: np.ndarray, gravity: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Coriolis, centrifugal and gravity torques with shape (..., dof), by RNEA with zero acceleration."""
+    return inverse_dynamics(comp, q, qd, np.zeros(comp.dof), gravity)
+
+
+def forward_dynamics(
+    comp: compiled.CompiledChain,
+    q: np.ndarray,
+    qd: np.ndarray,
+    tau: np.ndarray,
+    gravity: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Joint accelerations produced by joint forces and torques, by the articulated body algorithm.
+
+    Velocities are propagated from the root, articulated inertias are accumulated from the
+    leaves and accelerations are resolved from the root again, each pass one tree level at
+    a time, so the cost is O(n). Trees in which several frames share a joint parameter do
+    not have independent joint accelerations for ABA to solve for; for them the mass matrix
+    is factored instead.
+
+    Parameters
+    ----------
+    comp : compiled.CompiledChain
+        Compiled chain.
+    q, qd, tau : np.ndarray
+        Joint positions, velocities and forces or torques with shape (..., dof). They are
+        broadcast against each other.
+    gravity : Optional[np.ndarray], optional
+        Gravitational acceleration in root frame coordinates, by default `GRAVITY`
+
+    Returns
+    -------
+    np.ndarray
+        Joint accelerations with shape (..., dof). Joints moving no mass get zero acceleration.
+    """
+    movable = comp._movable
+    if len(np.unique(comp.joint_indices[movable])) < np.count_nonzero(movable):
+        rhs = np.asarray(tau, dtype=float) - bias_forces(comp, q, qd, gravity)
+        return np.linalg.solve(mass_matrix(comp, q), rhs[..., None])[..., 0]
+    shape, (q, qd, tau) = _flatten(comp, q, qd, tau)
+    rot, pos, axes = _frame_poses(comp, comp.frame_matrices(q))
+    n = comp.n_frames
+    motion = _joint_motions(comp, pos, axes)
+    rate = motion * comp.frame_values(qd).T[..., None]
+    vel = _prefix_sums(comp, rate)
+    bias_acc = _cross_motion(vel, rate)
+    # Articulated inertias and bias forces, with an extra last row that the roots pass theirs to.
+    inertia = np.zeros((n + 1,) + motion.shape[1:] + (6,))
+    inertia[:n] = _spatial_inertias(comp, rot, pos)
+    bias = np.zeros((n + 1,) + motion.shape[1:])
+    bias[:n] = _cross_force(vel, np.einsum("nbij,nbj->nbi", inertia[:n], vel))
+    force = comp.frame_values(tau).T
+    projected = np.zeros_like(motion)
+    inv_inertia = np.zeros(force.shape)
+    residual = np.zeros(force.shape)
+    for level in reversed(comp.levels):
+        s = motion[level]
+        u = np.einsum("lbij,lbj->lbi", inertia[level], s)
+        d = np.einsum("lbi,lbi->lb", s, u)
+        d_inv = np.divide(1.0, d, out=np.zeros_like(d), where=d > 0.0)
+        r = force[level] - np.einsum("lbi,lbi->lb", s, bias[level])
+        projected[level], inv_inertia[level], residual[level] = u, d_inv, r
+        articulated = inertia[level] - u[..., :, None] * (u * d_inv[..., None])[..., None, :]
+        parents = comp.parents[level]
+        np.add.at(inertia, parents, articulated)
+        np.add.at(
+            bias,
+            parents,
+            bias[level] + np.einsum("lbij,lbj->lbi", articulated, bias_acc[level]) + u * (r * d_inv)[..., None],
+        )
+    g = GRAVITY if gravity is None else np.asarray(gravity, dtype=float)
+    acc = np.zeros((n + 1,) + motion.shape[1:])
+    acc[n, :, 3:] = -g
+    qdd_frames = np.zeros(force.shape)
+    for level in comp.levels:
+        a = acc[comp.parents[level]] + bias_acc[level]
+        qdd = (residual[level] - np.einsum("lbi,lbi->lb", projected[level], a)) * inv_inertia[level]
+        acc[level] = a + motion[level] * qdd[..., None]
+        qdd_frames[level] = qdd
+    qdd = np.zeros((force.shape[1], comp.dof))
+    qdd[:, comp.joint_indices[movable]] = qdd_frames[movable].T
+    return qdd.reshape(shape + (comp.dof,))
+
+
+def rollout(
+    comp: compiled.CompiledChain,
+    q: np.ndarray,
+    qd: np.ndarray,
+    tau: np.ndarray,
+    dt: float,
+    gravity: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate the chain with fixed time steps of semi-implicit Euler integration.
+
+    Parameters
+    ----------
+    comp : compiled.CompiledChain
+        Compiled chain.
+    q, qd : np.ndarray
+        Initial joint positions and velocities with shape (..., dof), e.g. (N, dof) for N
+        environments stepped together.
+    tau : np.ndarray
+        Joint forces and torques applied during each step with shape (T, ..., dof).
+    dt : float
+        Time step.
+    gravity : Optional[np.ndarray], optional
+        Gravitational acceleration in root frame coordinates, by default `GRAVITY`
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Joint positions and velocities after each step, with shape (T, ..., dof).
+    """
+    tau = np.asarray(tau, dtype=float)
+    shape = np.broadcast_shapes(np.shape(q), np.shape(qd), tau.shape[1:])
+    q = np.array(np.broadcast_to(q, shape), dtype=float)
+    qd = np.array(np.broadcast_to(qd, shape), dtype=float)
+    positions = np.empty((len(tau),) + shape)
+    velocities = np.empty((len(tau),) + shape)
+    for t in range(len(tau)):
+        qd += dt * forward_dynamics(comp, q, qd, tau[t], gravity)
+        q += dt * qd
+        positions[t] = q
+        velocities[t] = qd
+    return positions, velocities
+
+
+def link_motion(
+    comp: compiled.CompiledChain, q: np.ndarray, qd: np.ndarray, qdd: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """World poses, velocities and accelerations of all links from a single root-to-leaves pass.
+
+    Parameters
+    ----------
+    comp : compiled.CompiledChain
+        Compiled chain.
+    q, qd : np.ndarray
+        Joint positions and velocities with shape (..., dof).
+    qdd : Optional[np.ndarray], optional
+        Joint accelerations with shape (..., dof), by default None (no accelerations).
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]
+        Link poses as homogeneous matrices with shape (..., n_frames, 4, 4), link twists with
+        shape (..., n_frames, 6) and their time derivatives with the same shape (None without
+        `qdd`). Twists follow the Jacobian layout: the velocity of the link origin followed by
+        the angular velocity, in world coordinates, so they equal `J(q) @ qd`.
+    """
+    with_acc = qdd is not None
+    shape, (q, qd, qdd) = _flatten(comp, q, qd, np.zeros(comp.dof) if qdd is None else qdd)
+    frames = comp.frame_matrices(q)
+    rot, pos, axes = _frame_poses(comp, frames)
+    omega, vel, alpha, acc = _motion(comp, pos, axes, qd, qdd, np.zeros(3))
+    # Offsets from the frame origins to the link origins.
+    offset = np.einsum("nbij,nj->nbi", rot, comp.link_offsets[:, :3, 3])
+    n = comp.n_frames
+    poses = np.matmul(frames, comp.link_offsets).reshape(shape + (n, 4, 4))
+    twists = np.concatenate([vel + _cross(omega, offset), omega], axis=-1)
+    twists = np.swapaxes(twists, 0, 1).reshape(shape + (n, 6))
+    if not with_acc:
+        return poses, twists, None
+    linear = acc + _cross(alpha, offset) + _cross(omega, _cross(omega, offset))
+    accelerations = np.concatenate([linear, alpha], axis=-1)
+    return poses, twists, np.swapaxes(accelerations, 0, 1).reshape(shape + (n, 6))
@@ -1,7 +1,7 @@
-from typing import Any, Iterator, List, Optional
+import math
+from typing import Any, Iterator, List, Optional, Tuple
 
 import numpy as np
-import transformations as tf
 
 from . import transform
 
@@ -26,12 +26,28 @@ class Visual:
 
 
 class Link:
+    """Link of a kinematic tree.
+
+    The inertial parameters are expressed in the link frame: `com` is the center of mass
+    position and `inertia` the 3x3 inertia tensor about the center of mass.
+    Links without inertial data have zero mass.
+    """
+
     def __init__(
-        self, name: Optional[str] = None, offset: Optional[transform.Transform] = None, visuals: Optional[List] = None
+        self,
+        name: Optional[str] = None,
+        offset: Optional[transform.Transform] = None,
+        visuals: Optional[List] = None,
+        mass: float = 0.0,
+        com: Optional[List[float]] = None,
+        inertia: Optional[np.ndarray] = None,
     ) -> None:
         self.name = name if name is not None else "none"
         self.offset = offset or transform.Transform()
         self.visuals = visuals or []
+        self.mass = float(mass)
+        self.com = np.zeros(3) if com is None else np.array(com, dtype=float)
+        self.inertia = np.zeros((3, 3)) if inertia is None else np.array(inertia, dtype=float).reshape(3, 3)
 
     def __repr__(self) -> str:
         return "Link(name='{0}', offset={1}, visuals={2})".format(self.name, self.offset, self.visuals)
@@ -46,10 +62,16 @@ class Joint:
         offset: Optional[transform.Transform] = None,
         joint_type: str = "fixed",
         axis: Optional[List[float]] = None,
+        limits: Optional[Tuple[float, float]] = None,
+        velocity_limit: Optional[float] = None,
+        effort_limit: Optional[float] = None,
     ) -> None:
         self.name = name if name is not None else "none"
         self.offset = offset or transform.Transform()
         self.joint_type = joint_type
+        self.limits = limits
+        self.velocity_limit = velocity_limit
+        self.effort_limit = effort_limit
         if self.joint_type != "fixed" and axis is None:
             self.axis = np.array([0.0, 0.0, 1.0])
         else:
@@ -105,9 +127,11 @@ class Frame:
 
     def get_transform(self, theta: float = 0.0) -> transform.Transform:
         if self.joint.joint_type == "revolute":
-            t = transform.Transform(tf.quaternion_about_axis(theta, self.joint.axis))
+            x, y, z = self.joint.axis.tolist()
+            s = math.sin(theta / 2.0) / math.sqrt(x * x + y * y + z * z)
+            t = transform.Transform._from_arrays(np.array([math.cos(theta / 2.0), s * x, s * y, s * z]), np.zeros(3))
         elif self.joint.joint_type == "prismatic":
-            t = transform.Transform(pos=theta * self.joint.axis)
+            t = transform.Transform._from_arrays(np.array([1.0, 0.0, 0.0, 0.0]), theta * self.joint.axis)
         elif self.joint.joint_type == "fixed":
             t = transform.Transform()
         else:
@@ -115,6 +139,8 @@ class Frame:
         return self.joint.offset * t
 
     def walk(self) -> Iterator["Frame"]:
-        yield self
-        for child in self.children:
-            yield from child.walk()
+        stack = [self]
+        while stack:
+            f = stack.pop()
+            yield f
+            stack.extend(reversed(f.children))
@@ -1,11 +1,90 @@
+import time
 from typing import Any, Optional
 
 import numpy as np
-import scipy.optimize as sco
 
 from . import transform
 
 
+class IKResult:
+    """Result of an iterative inverse kinematics solve.
+
+    Attributes
+    ----------
+    solution : np.ndarray
+        Joint parameters with the smallest pose error found.
+    converged : bool
+        Whether the pose error reached the tolerance.
+    error : float
+        Norm of the 6D pose error (position and rotation vector) at the solution.
+    iterations : int
+        Number of iterations performed.
+    """
+
+    def __init__(self, solution: np.ndarray, converged: bool, error: float, iterations: int) -> None:
+        self.solution = solution
+        self.converged = converged
+        self.error = error
+        self.iterations = iterations
+
+    def __repr__(self) -> str:
+        return "IKResult(solution={0}, converged={1}, error={2}, iterations={3})".format(
+            self.solution, self.converged, self.error, self.iterations
+        )
+
+
+class IKBatchResult:
+    """Result of a batched iterative inverse kinematics solve.
+
+    Attributes
+    ----------
+    solutions : np.ndarray
+        Joint parameters with shape (N, dof).
+    success : np.ndarray
+        Boolean mask with shape (N,) of targets whose pose error reached the tolerance.
+    residuals : np.ndarray
+        Norms of the 6D pose errors with shape (N,).
+    iterations : np.ndarray
+        Number of iterations performed for each target with shape (N,).
+    """
+
+    def __init__(
+        self, solutions: np.ndarray, success: np.ndarray, residuals: np.ndarray, iterations: np.ndarray
+    ) -> None:
+        self.solutions = solutions
+        self.success = success
+        self.residuals = residuals
+        self.iterations = iterations
+
+    def __repr__(self) -> str:
+        return "IKBatchResult(solutions={0}, success={1}, residuals={2}, iterations={3})".format(
+            self.solutions, self.success, self.residuals, self.iterations
+        )
+
+
+def pose_error(target: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """6D error between homogeneous matrices in world coordinates.
+
+    Parameters
+    ----------
+    target : np.ndarray
+        Target poses with shape (..., 4, 4).
+    current : np.ndarray
+        Current poses with shape (..., 4, 4).
+
+    Returns
+    -------
+    np.ndarray
+        Position error and rotation vector taking `current` to `target`, with shape (..., 6).
+    """
+    rot = np.matmul(target[..., :3, :3], np.swapaxes(current[..., :3, :3], -1, -2))
+    quat = transform.quaternion_from_matrix(rot)
+    sin_half = np.linalg.norm(quat[..., 1:], axis=-1, keepdims=True)
+    angle = 2.0 * np.arctan2(sin_half, quat[..., :1])
+    scale = np.divide(angle, sin_half, out=np.full_like(angle, 2.0), where=sin_half > 1.0e-12)
+    return np.concatenate([target[..., :3, 3] - current[..., :3, 3], scale * quat[..., 1:]], axis=-1)
+
+
 def inverse_kinematics(
     serial_chain: Any, pose: transform.Transform, initial_state: Optional[np.ndarray] = None
 ) -> np.ndarray:
@@ -20,5 +99,146 @@ def inverse_kinematics(
         obj = np.square(np.linalg.lstsq(pose.matrix(), tf.matrix(), rcond=-1)[0] - np.identity(4)).sum()
         return obj
 
+    import scipy.optimize as sco
+
     ret = sco.minimize(object_fn, x0, method="BFGS")
     return ret.x
+
+
+def inverse_kinematics_dls(
+    serial_chain: Any,
+    pose: transform.Transform,
+    initial_state: Optional[np.ndarray] = None,
+    tol: float = 1.0e-6,
+    max_iter: int = 100,
+    time_budget: Optional[float] = None,
+    damping: float = 1.0e-2,
+) -> IKResult:
+    """Inverse kinematics by damped least squares with adaptive (Levenberg-Marquardt) damping.
+
+    Parameters
+    ----------
+    serial_chain : SerialChain
+        Serial chain.
+    pose : transform.Transform
+        Target pose of the end link.
+    initial_state : Optional[np.ndarray], optional
+        Initial joint parameters, by default zeros.
+    tol : float, optional
+        Tolerance on the norm of the 6D pose error, by default 1.0e-6
+    max_iter : int, optional
+        Maximum number of iterations, by default 100
+    time_budget : Optional[float], optional
+        Maximum wall clock time in seconds, by default None (unlimited)
+    damping : float, optional
+        Initial damping factor, by default 1.0e-2
+
+    Returns
+    -------
+    IKResult
+        Solve result.
+    """
+    start = time.perf_counter()
+    comp = serial_chain.compile()
+    end = comp.n_frames - 1
+    q = np.zeros(comp.dof) if initial_state is None else np.array(initial_state, dtype=float)
+    q = np.clip(q, comp.lower, comp.upper)
+    target = pose.matrix()
+    jac, cur = comp.jacobian(q, end)
+    err = pose_error(target, cur)
+    err_norm = np.linalg.norm(err)
+    lam = damping
+    eye = np.identity(6)
+    iterations = 0
+    while err_norm > tol and iterations < max_iter:
+        if time_budget is not None and time.perf_counter() - start > time_budget:
+            break
+        iterations += 1
+        dq = np.dot(jac.T, np.linalg.solve(np.dot(jac, jac.T) + lam * lam * eye, err))
+        q_new = np.clip(q + dq, comp.lower, comp.upper)
+        jac_new, cur_new = comp.jacobian(q_new, end)
+        err_new = pose_error(target, cur_new)
+        err_new_norm = np.linalg.norm(err_new)
+        if err_new_norm < err_norm:
+            q, jac, err, err_norm = q_new, jac_new, err_new, err_new_norm
+            lam = max(lam * 0.5, 1.0e-9)
+        else:
+            lam = min(lam * 4.0, 1.0e6)
+    return IKResult(q, bool(err_norm <= tol), float(err_norm), iterations)
+
+
+def inverse_kinematics_dls_batch(
+    serial_chain: Any,
+    poses: transform.TransformBatch,
+    initial_states: Optional[np.ndarray] = None,
+    tol: float = 1.0e-6,
+    max_iter: int = 100,
+    time_budget: Optional[float] = None,
+    damping: float = 1.0e-2,
+) -> IKBatchResult:
+    """Solve damped least-squares inverse kinematics for many target poses simultaneously.
+
+    Every iteration evaluates FK and Jacobians of all unconverged targets in one vectorized step;
+    converged targets are masked out. Iterates are clamped to the joint limits of the chain.
+
+    Parameters
+    ----------
+    serial_chain : SerialChain
+        Serial chain.
+    poses : transform.TransformBatch
+        Target poses of the end link with batch shape (N,).
+    initial_states : Optional[np.ndarray], optional
+        Initial joint parameters with shape (N, dof) or (dof,), by default zeros.
+    tol : float, optional
+        Tolerance on the norm of the 6D pose error, by default 1.0e-6
+    max_iter : int, optional
+        Maximum number of iterations, by default 100
+    time_budget : Optional[float], optional
+        Maximum wall clock time in seconds, by default None (unlimited)
+    damping : float, optional
+        Initial damping factor, by default 1.0e-2
+
+    Returns
+    -------
+    IKBatchResult
+        Solve result.
+    """
+    start = time.perf_counter()
+    comp = serial_chain.compile()
+    end = comp.n_frames - 1
+    target = poses.matrix()
+    n = len(target)
+    if initial_states is None:
+        q = np.zeros((n, comp.dof))
+    else:
+        q = np.array(np.broadcast_to(initial_states, (n, comp.dof)), dtype=float)
+    q = np.clip(q, comp.lower, comp.upper)
+    jac, cur = comp.jacobian(q, end)
+    err = pose_error(target, cur)
+    err_norm = np.linalg.norm(err, axis=-1)
+    lam = np.full(n, damping)
+    iterations = np.zeros(n, dtype=int)
+    eye = np.identity(6)
+    for _ in range(max_iter):
+        active = np.flatnonzero(err_norm > tol)
+        if len(active) == 0:
+            break
+        if time_budget is not None and time.perf_counter() - start > time_budget:
+            break
+        iterations[active] += 1
+        j = jac[active]
+        jt = np.swapaxes(j, -1, -2)
+        lhs = np.matmul(j, jt) + (lam[active] ** 2)[:, None, None] * eye
+        dq = np.matmul(jt, np.linalg.solve(lhs, err[active][..., None]))[..., 0]
+        q_new = np.clip(q[active] + dq, comp.lower, comp.upper)
+        jac_new, cur_new = comp.jacobian(q_new, end)
+        err_new = pose_error(target[active], cur_new)
+        err_new_norm = np.linalg.norm(err_new, axis=-1)
+        improved = err_new_norm < err_norm[active]
+        accept = active[improved]
+        q[accept] = q_new[improved]
+        jac[accept] = jac_new[improved]
+        err[accept] = err_new[improved]
+        err_norm[accept] = err_new_norm[improved]
+        lam[active] = np.where(improved, np.maximum(lam[active] * 0.5, 1.0e-9), np.minimum(lam[active] * 4.0, 1.0e6))
+    return IKBatchResult(q, err_norm <= tol, err_norm, iterations)
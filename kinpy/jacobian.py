@@ -1,77 +1,62 @@
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple, Union
 
 import numpy as np
 
 from . import transform
 
 
-def calc_jacobian(serial_chain: Any, th: List[float], tool: Optional[transform.Transform] = None) -> np.ndarray:
-    tool = tool or transform.Transform()
-    ndof = len(th)
-    j_fl = np.zeros((6, ndof))
-    cur_transform = tool.matrix()
-
-    cnt = 0
-    for f in reversed(serial_chain._serial_frames):
-        if f.joint.joint_type == "revolute":
-            cnt += 1
-            delta = np.dot(f.joint.axis, cur_transform[:3, :3])
-            d = np.dot(np.cross(f.joint.axis, cur_transform[:3, 3]), cur_transform[:3, :3])
-            j_fl[:, -cnt] = np.hstack((d, delta))
-        elif f.joint.joint_type == "prismatic":
-            cnt += 1
-            j_fl[:3, -cnt] = np.dot(f.joint.axis, cur_transform[:3, :3])
-        cur_frame_transform = f.get_transform(th[-cnt]).matrix()
-        cur_transform = np.dot(cur_frame_transform, cur_transform)
-
-    pose = serial_chain.forward_kinematics(th).matrix()
-    rotation = pose[:3, :3]
-    j_tr = np.zeros((6, 6))
-    j_tr[:3, :3] = rotation
-    j_tr[3:, 3:] = rotation
-    j_w = np.dot(j_tr, j_fl)
-    return j_w
+def _pose(mat: np.ndarray) -> Union[transform.Transform, transform.TransformBatch]:
+    if mat.ndim > 2:
+        return transform.TransformBatch.from_matrix(mat)
+    return transform.Transform._from_arrays(transform.quaternion_from_matrix(mat), mat[:3, 3].copy())
+
+
+def calc_jacobian(
+    serial_chain: Any,
+    th: Union[List[float], np.ndarray],
+    tool: Optional[transform.Transform] = None,
+    return_pose: bool = False,
+    out: Optional[np.ndarray] = None,
+) -> Union[np.ndarray, Tuple[np.ndarray, Union[transform.Transform, transform.TransformBatch]]]:
+    """Calculate the geometric Jacobian of the end link in world coordinates.
+
+    FK and the Jacobian are evaluated together in a single forward sweep.
+
+    Parameters
+    ----------
+    serial_chain : SerialChain
+        Serial chain.
+    th : Union[List[float], np.ndarray]
+        Joint parameters with shape (dof,) or a batch with shape (N, dof).
+    tool : Optional[transform.Transform], optional
+        Tool transform relative to the end link, by default None
+    return_pose : bool, optional
+        Also return the pose of the end link (including the tool), by default False
+    out : Optional[np.ndarray], optional
+        Preallocated array for the Jacobian, by default None
+
+    Returns
+    -------
+    Union[np.ndarray, Tuple[np.ndarray, Union[transform.Transform, transform.TransformBatch]]]
+        Jacobian with shape (6, dof) or (N, 6, dof), and the end pose if `return_pose` is True.
+    """
+    comp = serial_chain.compile()
+    jac, pose = comp.jacobian(np.asarray(th, dtype=float), comp.n_frames - 1, tool, out)
+    return (jac, _pose(pose)) if return_pose else jac
 
 
 def calc_jacobian_frames(
-    serial_chain: Any, th: List[float], link_name: str, tool: Optional[transform.Transform] = None
-) -> np.ndarray:
-    tool = tool or transform.Transform()
-    ndof = len(th)
-    j_fl = np.zeros((6, ndof))
-    cur_transform = tool.matrix()
-
-    # select first num_th movable joints
-    serial_frames = []
-    num_movable_joints = 0
-    for serial_frame in serial_chain._serial_frames:
-        serial_frames.append(serial_frame)
-        if serial_frame.joint.joint_type != "fixed":
-            num_movable_joints += 1
-
-        if serial_frame.link.name == link_name:
-            break  # found first n joints
-
-    cnt = len(th) - num_movable_joints  # only first num_th joints
-    for f in reversed(serial_frames):
-        if f.joint.joint_type == "revolute":
-            cnt += 1
-            delta = np.dot(f.joint.axis, cur_transform[:3, :3])
-            d = np.dot(np.cross(f.joint.axis, cur_transform[:3, 3]), cur_transform[:3, :3])
-            j_fl[:, -cnt] = np.hstack((d, delta))
-        elif f.joint.joint_type == "prismatic":
-            cnt += 1
-            j_fl[:3, -cnt] = np.dot(f.joint.axis, cur_transform[:3, :3])
-        cur_frame_transform = f.get_transform(th[-cnt]).matrix()
-        cur_transform = np.dot(cur_frame_transform, cur_transform)
-
-    poses = serial_chain.forward_kinematics(th, end_only=False)
-    pose = poses[link_name].matrix()
-
-    rotation = pose[:3, :3]
-    j_tr = np.zeros((6, 6))
-    j_tr[:3, :3] = rotation
-    j_tr[3:, 3:] = rotation
-    j_w = np.dot(j_tr, j_fl)
-
-    return j_w
+    serial_chain: Any,
+    th: Union[List[float], np.ndarray],
+    link_name: str,
+    tool: Optional[transform.Transform] = None,
+    return_pose: bool = False,
+    out: Optional[np.ndarray] = None,
+) -> Union[np.ndarray, Tuple[np.ndarray, Union[transform.Transform, transform.TransformBatch]]]:
+    """Calculate the geometric Jacobian of a link of the serial chain in world coordinates.
+
+    Columns of joints after the link are zero.
+    """
+    comp = serial_chain.compile()
+    jac, pose = comp.jacobian(np.asarray(th, dtype=float), serial_chain.get_link_index(link_name), tool, out)
+    return (jac, _pose(pose)) if return_pose else jac
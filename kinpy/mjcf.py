@@ -1,5 +1,8 @@
 import io
-from typing import Any, Dict, Optional, TextIO, Union
+import math
+from typing import Any, Dict, Optional, TextIO, Tuple, Union
+
+import numpy as np
 
 from . import chain, frame, mjcf_parser, transform
 
@@ -35,6 +38,131 @@ def body_to_link(body, base: Optional[transform.Transform] = None):
     return frame.Link(body.name, offset=base * transform.Transform(body.quat, body.pos))
 
 
+def _default_attribute(element, name: str) -> Any:
+    """Resolve a joint or geom attribute through its default classes."""
+    value = getattr(element, name)
+    if value is not None:
+        return value
+    dclass = element.dclass
+    parent = element.parent
+    while dclass is None and parent is not None and parent.tag == "body":
+        dclass = parent.childclass
+        parent = parent.parent
+    while dclass is not None and dclass.tag == "default":
+        value = getattr(getattr(dclass, element.tag), name)
+        if value is not None:
+            return value
+        dclass = dclass.parent
+    return getattr(getattr(element.root.default, element.tag), name)
+
+
+def _geom_inertial(geom) -> Optional[Tuple[float, np.ndarray, np.ndarray]]:
+    """Mass, center of mass and inertia about the center of mass of a geom of uniform density in its body frame.
+
+    Returns None for geometry types whose volume is not known here (meshes, planes and height fields).
+    """
+    geom_type = _default_attribute(geom, "type") or "sphere"
+    size = _default_attribute(geom, "size")
+    fromto = _default_attribute(geom, "fromto")
+    if geom_type not in ("sphere", "capsule", "cylinder", "box", "ellipsoid") or size is None:
+        return None
+    if fromto is not None and geom_type in ("capsule", "cylinder"):
+        start, end = np.asarray(fromto[:3], dtype=float), np.asarray(fromto[3:], dtype=float)
+        half = 0.5 * np.linalg.norm(end - start)
+        axis = (end - start) / (2.0 * half) if half > 0.0 else np.array([0.0, 0.0, 1.0])
+        com = 0.5 * (start + end)
+        rot = np.identity(3)
+    else:
+        axis = np.array([0.0, 0.0, 1.0])
+        tf = transform.Transform(geom.quat, geom.pos)
+        com = tf.pos
+        rot = tf.rot_mat
+        half = float(size[1]) if len(size) > 1 else 0.0
+    r = float(size[0])
+    density = _default_attribute(geom, "density")
+    density = 1000.0 if density is None else float(density)
+    if geom_type == "sphere":
+        mass = density * 4.0 / 3.0 * math.pi * r**3
+        diag = np.full(3, 0.4 * mass * r**2)
+    elif geom_type in ("capsule", "cylinder"):
+        m_cyl = density * math.pi * r**2 * 2.0 * half
+        axial = 0.5 * m_cyl * r**2
+        transverse = m_cyl * (3.0 * r**2 + 4.0 * half**2) / 12.0
+        mass = m_cyl
+        if geom_type == "capsule":
+            m_caps = density * 4.0 / 3.0 * math.pi * r**3
+            axial += 0.4 * m_caps * r**2
+            transverse += m_caps * (0.4 * r**2 + half**2 + 0.75 * half * r)
+            mass += m_caps
+        diag = np.array([transverse, transverse, axial])
+    else:
+        a, b, c = [float(v) for v in size[:3]]
+        if geom_type == "box":
+            mass = density * 8.0 * a * b * c
+            diag = mass / 3.0 * np.array([b**2 + c**2, a**2 + c**2, a**2 + b**2])
+        else:
+            mass = density * 4.0 / 3.0 * math.pi * a * b * c
+            diag = mass / 5.0 * np.array([b**2 + c**2, a**2 + c**2, a**2 + b**2])
+    geom_mass = _default_attribute(geom, "mass")
+    if geom_mass is not None and mass > 0.0:
+        diag *= float(geom_mass) / mass
+        mass = float(geom_mass)
+    if geom_type in ("capsule", "cylinder"):
+        # Axially symmetric: the tensor only depends on the direction of the axis.
+        inertia = diag[0] * np.identity(3) + (diag[2] - diag[0]) * np.outer(axis, axis)
+    else:
+        inertia = np.diag(diag)
+    return mass, com, rot @ inertia @ rot.T
+
+
+def _body_inertial(body, base: Optional[transform.Transform] = None) -> Tuple[float, np.ndarray, np.ndarray]:
+    """Mass, center of mass and inertia about it of a body, expressed in the frame `base` maps the body frame into.
+
+    As in MuJoCo, an explicit <inertial> element is used unless the compiler option
+    `inertiafromgeom` is "true", and the geoms are used if it is missing and the option is not "false".
+    """
+    from_geom = body.root.compiler.inertiafromgeom
+    inertial = body.inertial
+    if inertial is not None and from_geom != "true":
+        tf = transform.Transform(inertial.quat, inertial.pos)
+        if inertial.fullinertia is not None:
+            ixx, iyy, izz, ixy, ixz, iyz = [float(v) for v in inertial.fullinertia]
+            inertia = np.array([[ixx, ixy, ixz], [ixy, iyy, iyz], [ixz, iyz, izz]])
+        elif inertial.diaginertia is not None:
+            inertia = np.diag(np.asarray(inertial.diaginertia, dtype=float))
+        else:
+            inertia = np.zeros((3, 3))
+        rot = tf.rot_mat
+        mass, com, inertia = float(inertial.mass), tf.pos, rot @ inertia @ rot.T
+    elif from_geom != "false":
+        parts = [p for p in (_geom_inertial(g) for g in body.geom) if p is not None]
+        mass = sum(m for m, _, _ in parts)
+        if mass <= 0.0:
+            return 0.0, np.zeros(3), np.zeros((3, 3))
+        com = np.sum([m * c for m, c, _ in parts], axis=0) / mass
+        inertia = np.zeros((3, 3))
+        for m, c, i in parts:
+            d = c - com
+            inertia += i + m * (np.dot(d, d) * np.identity(3) - np.outer(d, d))
+    else:
+        return 0.0, np.zeros(3), np.zeros((3, 3))
+    if base is None:
+        return mass, com, inertia
+    rot = base.rot_mat
+    return mass, rot @ com + base.pos, rot @ inertia @ rot.T
+
+
+def joint_limits(joint) -> Optional[Tuple[float, float]]:
+    """Joint range in radians (hinge) or meters (slide), or None if the joint is not limited."""
+    joint_range = _default_attribute(joint, "range")
+    if joint_range is None or _default_attribute(joint, "limited") == "false":
+        return None
+    lower, upper = float(joint_range[0]), float(joint_range[1])
+    if JOINT_TYPE_MAP[joint.type] == "revolute" and joint.root.compiler.angle != "radian":
+        lower, upper = math.radians(lower), math.radians(upper)
+    return lower, upper
+
+
 def joint_to_joint(joint, base: Optional[transform.Transform] = None):
     base = base or transform.Transform()
     return frame.Joint(
@@ -42,6 +170,7 @@ def joint_to_joint(joint, base: Optional[transform.Transform] = None):
         offset=base * transform.Transform(pos=joint.pos),
         joint_type=JOINT_TYPE_MAP[joint.type],
         axis=joint.axis,
+        limits=joint_limits(joint),
     )
 
 
@@ -72,10 +201,13 @@ def _build_chain_recurse(root_frame, root_body):
     base = root_frame.link.offset
     cur_frame, cur_base = add_composite_joint(root_frame, root_body.joint, base)
     jbase = cur_base.inverse() * base
+    link = cur_frame.link
     if len(root_body.joint) > 0:
-        cur_frame.link.visuals = geoms_to_visuals(root_body.geom, jbase)
+        link.visuals = geoms_to_visuals(root_body.geom, jbase)
+        link.mass, link.com, link.inertia = _body_inertial(root_body, jbase)
     else:
-        cur_frame.link.visuals = geoms_to_visuals(root_body.geom)
+        link.visuals = geoms_to_visuals(root_body.geom)
+        link.mass, link.com, link.inertia = _body_inertial(root_body)
     for b in root_body.body:
         cur_frame.children = cur_frame.children + [frame.Frame()]
         next_frame = cur_frame.children[-1]
@@ -16,13 +16,17 @@
 """A Python object representation of Mujoco's MJCF schema.
 
 The root schema is provided as a module-level constant `schema.MUJOCO`.
+It is built on first access rather than at import time, from a precompiled
+pickle (see `compile_schema`) when one matching `schema.xml` is available.
 """
 
 from __future__ import absolute_import, division, print_function
 
 import collections
 import copy
+import hashlib
 import os
+import pickle
 import pkgutil
 
 import six
@@ -32,6 +36,7 @@ from . import attribute
 from . import io as resources
 
 _SCHEMA_XML_PATH = "mjcf_parser/schema.xml"
+_SCHEMA_PICKLE_PATH = "mjcf_parser/schema.pkl"
 
 _ARRAY_DTYPE_MAP = {"int": int, "float": float, "string": str}
 
@@ -187,8 +192,43 @@ def collect_namespaces(root_spec):
     return findable_namespaces
 
 
-MUJOCO = parse_schema(_SCHEMA_XML_PATH)
-FINDABLE_NAMESPACES = frozenset(collect_namespaces(MUJOCO).union(_ADDITIONAL_FINDABLE_NAMESPACES))
+def _load_schema():
+    """Loads the root `ElementSpec`, preferring a precompiled pickle of the same schema XML."""
+    schema_data = pkgutil.get_data("kinpy", _SCHEMA_XML_PATH)
+    digest = hashlib.sha256(schema_data).hexdigest()
+    try:
+        pickle_data = pkgutil.get_data("kinpy", _SCHEMA_PICKLE_PATH)
+    except OSError:
+        pickle_data = None
+    if pickle_data is not None:
+        try:
+            pickled_digest, spec = pickle.loads(pickle_data)
+        except Exception:  # pylint: disable=broad-except
+            pickled_digest, spec = None, None
+        if pickled_digest == digest:
+            return spec
+    return _parse_element(etree.fromstring(schema_data))
+
+
+def compile_schema(output_path=None):
+    """Precompiles the schema XML into a pickle that is loaded instead of parsing the XML.
+
+    The pickle records a hash of the schema XML it was built from and is ignored
+    if the XML changes.
+
+    Args:
+      output_path: (optional) Path of the pickle file. Defaults to `schema.pkl`
+        next to `schema.xml`, where it is picked up automatically.
+
+    The pickle is not part of the built wheel, so installed packages parse the XML
+    unless this is run against the installed `kinpy` once.
+    """
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(__file__), "schema.pkl")
+    schema_data = pkgutil.get_data("kinpy", _SCHEMA_XML_PATH)
+    spec = _parse_element(etree.fromstring(schema_data))
+    with open(output_path, "wb") as f:
+        pickle.dump((hashlib.sha256(schema_data).hexdigest(), spec), f, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 def _attachment_frame_spec(is_world_attachment):
@@ -214,7 +254,7 @@ def _attachment_frame_spec(is_world_attachment):
         children=collections.OrderedDict(),
     )
 
-    body_spec = MUJOCO.children["worldbody"].children["body"]
+    body_spec = _constant("MUJOCO").children["worldbody"].children["body"]
     # 'name' and 'childclass' attributes are excluded.
     for attrib_name in ("mocap", "pos", "quat", "axisangle", "xyaxes", "zaxis", "euler"):
         frame_spec.attributes[attrib_name] = copy.deepcopy(body_spec.attributes[attrib_name])
@@ -233,7 +273,7 @@ def _attachment_frame_spec(is_world_attachment):
     )
 
     if is_world_attachment:
-        freejoint_spec = MUJOCO.children["worldbody"].children["body"].children["freejoint"]
+        freejoint_spec = _constant("MUJOCO").children["worldbody"].children["body"].children["freejoint"]
         frame_spec.children["freejoint"] = ElementSpec(
             "freejoint",
             repeated=False,
@@ -247,5 +287,26 @@ def _attachment_frame_spec(is_world_attachment):
     return frame_spec
 
 
-ATTACHMENT_FRAME = _attachment_frame_spec(is_world_attachment=False)
-WORLD_ATTACHMENT_FRAME = _attachment_frame_spec(is_world_attachment=True)
+def __getattr__(name):
+    """Builds the schema constants on first access."""
+    if name == "MUJOCO":
+        value = _load_schema()
+    elif name == "FINDABLE_NAMESPACES":
+        value = frozenset(collect_namespaces(_constant("MUJOCO")).union(_ADDITIONAL_FINDABLE_NAMESPACES))
+    elif name == "ATTACHMENT_FRAME":
+        value = _attachment_frame_spec(is_world_attachment=False)
+    elif name == "WORLD_ATTACHMENT_FRAME":
+        value = _attachment_frame_spec(is_world_attachment=True)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def _constant(name):
+    """Returns a schema constant from within this module, building it if necessary."""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
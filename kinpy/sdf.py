@@ -1,5 +1,6 @@
+import functools
 import io
-from typing import List, TextIO, Union
+from typing import Any, Dict, List, TextIO, Union
 
 import numpy as np
 
@@ -40,24 +41,45 @@ def _convert_visuals(visuals: List) -> List:
     return vlist
 
 
-def _build_chain_recurse(root_frame, lmap, joints) -> List:
-    children = []
-    for j in joints:
-        if j.parent == root_frame.link.name:
-            child_frame = frame.Frame(j.child + "_frame")
-            link_p = lmap[j.parent]
-            link_c = lmap[j.child]
-            t_p = _convert_transform(link_p.pose)
-            t_c = _convert_transform(link_c.pose)
-            child_frame.joint = frame.Joint(
-                j.name, offset=t_p.inverse() * t_c, joint_type=JOINT_TYPE_MAP[j.type], axis=j.axis.xyz
-            )
-            child_frame.link = frame.Link(
-                link_c.name, offset=transform.Transform(), visuals=_convert_visuals(link_c.visuals)
-            )
-            child_frame.children = _build_chain_recurse(child_frame, lmap, joints)
-            children.append(child_frame)
-    return children
+def _convert_inertial(inertial) -> Dict[str, Any]:
+    """Link inertial parameters, with the inertia tensor rotated from the inertial frame into the link frame."""
+    if inertial is None:
+        return {}
+    pose = _convert_transform(inertial.pose)
+    rot = pose.rot_mat
+    inertia = np.zeros((3, 3)) if inertial.inertia is None else np.array(inertial.inertia.to_matrix())
+    return {"mass": inertial.mass, "com": pose.pos, "inertia": rot @ inertia @ rot.T}
+
+
+def _convert_limit_kwargs(joint) -> Dict[str, Any]:
+    limit = joint.axis.limit
+    if limit is None:
+        return {}
+    kwargs = {"velocity_limit": limit.velocity, "effort_limit": limit.effort}
+    if limit.lower is not None and limit.upper is not None:
+        kwargs["limits"] = (limit.lower, limit.upper)
+    return kwargs
+
+
+def _make_frame(lmap: Dict[str, Any], parent_frame: frame.Frame, j) -> frame.Frame:
+    t_p_inv = _convert_transform(lmap[parent_frame.link.name].pose).inverse()
+    link_c = lmap[j.child]
+    return frame.Frame(
+        j.child + "_frame",
+        link=frame.Link(
+            link_c.name,
+            offset=transform.Transform(),
+            visuals=_convert_visuals(link_c.visuals),
+            **_convert_inertial(link_c.inertial),
+        ),
+        joint=frame.Joint(
+            j.name,
+            offset=t_p_inv * _convert_transform(link_c.pose),
+            joint_type=JOINT_TYPE_MAP[j.type],
+            axis=j.axis.xyz,
+            **_convert_limit_kwargs(j),
+        ),
+    )
 
 
 def build_chain_from_sdf(data: Union[str, TextIO]) -> chain.Chain:
@@ -79,21 +101,15 @@ def build_chain_from_sdf(data: Union[str, TextIO]) -> chain.Chain:
     sdf = SDF.from_xml_string(data)
     robot = sdf.model
     lmap = robot.link_map
-    joints = robot.joints
-    n_joints = len(joints)
-    has_root = [True for _ in range(len(joints))]
-    for i in range(n_joints):
-        for j in range(i + 1, n_joints):
-            if joints[i].parent == joints[j].child:
-                has_root[i] = False
-            elif joints[j].parent == joints[i].child:
-                has_root[j] = False
-    for i in range(n_joints):
-        if has_root[i]:
-            root_link = lmap[joints[i].parent]
-            break
+    root_name, child_joints = chain._index_joints([link.name for link in robot.links], robot.joints)
+    root_link = lmap[root_name]
     root_frame = frame.Frame(root_link.name + "_frame")
     root_frame.joint = frame.Joint(offset=_convert_transform(root_link.pose))
-    root_frame.link = frame.Link(root_link.name, transform.Transform(), _convert_visuals(root_link.visuals))
-    root_frame.children = _build_chain_recurse(root_frame, lmap, joints)
+    root_frame.link = frame.Link(
+        root_link.name,
+        transform.Transform(),
+        _convert_visuals(root_link.visuals),
+        **_convert_inertial(root_link.inertial),
+    )
+    chain._build_tree(root_frame, child_joints, len(robot.joints), functools.partial(_make_frame, lmap))
     return chain.Chain(root_frame)
@@ -0,0 +1,144 @@
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from . import transform
+from .chain import Chain
+
+
+class KinematicState:
+    """Joint positions of a chain together with cached world transforms of its links.
+
+    Changing joint positions only invalidates the subtrees below the joints whose
+    values actually changed, and only those frames are recomputed when transforms
+    are queried. This suits interactive editing and teleoperation, where a few
+    joints move at a time.
+
+    Parameters
+    ----------
+    chain : Chain
+        Kinematic chain.
+    th : Union[Dict[str, float], List[float], np.ndarray, None], optional
+        Initial joint parameters, by default all zero.
+    world : Optional[transform.Transform], optional
+        World transform, by default None
+
+    Example
+    -------
+    >>> import kinpy as kp
+    >>> chain = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf")
+    >>> state = kp.KinematicState(chain)
+    >>> state.set_joint_positions({"lbr_iiwa_joint_7": 0.5})
+    ['lbr_iiwa_link_7']
+    >>> tf = state.link_transform("lbr_iiwa_link_7")
+    """
+
+    def __init__(
+        self,
+        chain: Chain,
+        th: Union[Dict[str, float], List[float], np.ndarray, None] = None,
+        world: Optional[transform.Transform] = None,
+    ) -> None:
+        self._chain = chain
+        self._compiled = chain.compile()
+        comp = self._compiled
+        self._joint_frames = [np.flatnonzero(comp.joint_indices == i) for i in range(comp.dof)]
+        self._q = np.zeros(comp.dof)
+        if th is not None:
+            self._q[:] = self._to_vector(th)
+        self._world = world
+        self._local = comp.local_matrices(self._q)
+        self._frames = np.empty_like(self._local)
+        self._links = np.empty_like(self._local)
+        self._stale = np.ones(comp.n_frames, dtype=bool)
+        self._transforms: List[Optional[transform.Transform]] = [None] * comp.n_frames
+
+    @property
+    def chain(self) -> Chain:
+        return self._chain
+
+    @property
+    def q(self) -> np.ndarray:
+        """Current joint parameter vector (a copy)."""
+        return self._q.copy()
+
+    def _to_vector(self, th: Union[Dict[str, float], List[float], np.ndarray]) -> np.ndarray:
+        if isinstance(th, dict):
+            q = self._q.copy()
+            for name, value in th.items():
+                q[self._chain.get_joint_index(name)] = value
+            return q
+        q = np.asarray(th, dtype=float)
+        assert q.shape == (self._compiled.dof,)
+        return q
+
+    def set_joint_positions(self, th: Union[Dict[str, float], List[float], np.ndarray]) -> List[str]:
+        """Update joint parameters.
+
+        Parameters
+        ----------
+        th : Union[Dict[str, float], List[float], np.ndarray]
+            Joint parameters. A dict only updates the listed joints and keeps the others.
+
+        Returns
+        -------
+        List[str]
+            Names of the links whose world transforms changed.
+        """
+        q = self._to_vector(th)
+        changed = np.flatnonzero(q != self._q)
+        if len(changed) == 0:
+            return []
+        self._q[changed] = q[changed]
+        frames = np.concatenate([self._joint_frames[i] for i in changed])
+        self._local[frames] = self._compiled.local_matrices(self._q, frames)
+        end = self._compiled.subtree_end
+        moved = np.zeros(self._compiled.n_frames, dtype=bool)
+        for f in frames:
+            moved[f : end[f]] = True
+        self._stale |= moved
+        link_names = self._compiled.link_names
+        return [link_names[i] for i in np.flatnonzero(moved)]
+
+    def set_world(self, world: Optional[transform.Transform]) -> None:
+        """Change the world transform, which moves every link."""
+        self._world = world
+        self._stale[:] = True
+
+    def _refresh(self) -> None:
+        stale = np.flatnonzero(self._stale)
+        if len(stale) == 0:
+            return
+        parents = self._compiled.parents
+        frames = self._frames
+        local = self._local
+        for i in stale:
+            p = parents[i]
+            if p >= 0:
+                frames[i] = np.dot(frames[p], local[i])
+            else:
+                frames[i] = local[i] if self._world is None else np.dot(self._world.matrix(), local[i])
+        self._links[stale] = np.matmul(frames[stale], self._compiled.link_offsets[stale])
+        quats = transform.quaternion_from_matrix(self._links[stale])
+        for i, rot in zip(stale, quats):
+            self._transforms[i] = transform.Transform._from_arrays(rot, self._links[i, :3, 3].copy())
+        self._stale[:] = False
+
+    def link_matrices(self) -> np.ndarray:
+        """World transforms of every link as homogeneous matrices with shape (n_frames, 4, 4)."""
+        self._refresh()
+        return self._links.copy()
+
+    def link_transform(self, name: str) -> transform.Transform:
+        """World transform of a link."""
+        index = self._chain.get_link_index(name)
+        if self._stale[index]:
+            self._refresh()
+        tf = self._transforms[index]
+        assert tf is not None
+        return tf
+
+    def link_transforms(self) -> Dict[str, transform.Transform]:
+        """World transforms of every link, as returned by `Chain.forward_kinematics`."""
+        self._refresh()
+        return {name: tf for name, tf in zip(self._compiled.link_names, self._transforms) if tf is not None}
@@ -1,9 +1,108 @@
-from typing import List, Optional, Union
+from typing import Any, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import transformations as tf
 
 
+def _quaternion_candidates_coefficients() -> np.ndarray:
+    # Each row of the symmetric matrix K is proportional to the quaternion (Shepperd's method),
+    # and K is linear in the entries of the rotation matrix: vec(K) = C @ [vec(R), 1].
+    coeffs = np.zeros((16, 10))
+    entries = {
+        (0, 0): {0: 1, 4: 1, 8: 1, 9: 1},
+        (0, 1): {7: 1, 5: -1},
+        (0, 2): {2: 1, 6: -1},
+        (0, 3): {3: 1, 1: -1},
+        (1, 1): {0: 1, 4: -1, 8: -1, 9: 1},
+        (1, 2): {1: 1, 3: 1},
+        (1, 3): {2: 1, 6: 1},
+        (2, 2): {0: -1, 4: 1, 8: -1, 9: 1},
+        (2, 3): {5: 1, 7: 1},
+        (3, 3): {0: -1, 4: -1, 8: 1, 9: 1},
+    }
+    for (i, j), terms in entries.items():
+        for k, v in terms.items():
+            coeffs[4 * i + j, k] = v
+            coeffs[4 * j + i, k] = v
+    return coeffs
+
+
+_QUATERNION_COEFFS = _quaternion_candidates_coefficients()
+
+
+def quaternion_from_matrix(mat: np.ndarray) -> np.ndarray:
+    """Convert rotation matrices into scalar-first quaternions.
+
+    Parameters
+    ----------
+    mat : np.ndarray
+        Rotation or homogeneous matrices with shape (..., 3, 3) or (..., 4, 4).
+
+    Returns
+    -------
+    np.ndarray
+        Quaternions with shape (..., 4) and non-negative scalar part.
+    """
+    m = np.asarray(mat, dtype=float)[..., :3, :3]
+    batch_shape = m.shape[:-2]
+    k = np.matmul(m.reshape(batch_shape + (9,)), _QUATERNION_COEFFS[:, :9].T) + _QUATERNION_COEFFS[:, 9]
+    k = k.reshape(batch_shape + (4, 4))
+    idx = np.argmax(np.diagonal(k, axis1=-2, axis2=-1), axis=-1)
+    q = np.take_along_axis(k, idx[..., None, None], axis=-2)[..., 0, :]
+    q /= np.sqrt(np.einsum("...i,...i->...", q, q))[..., None]
+    return np.where(q[..., :1] < 0.0, -q, q)
+
+
+def quaternion_multiply(q1: np.ndarray, q2: np.ndarray) -> np.ndarray:
+    """Multiply scalar-first quaternions with broadcasting over leading dimensions."""
+    w1, x1, y1, z1 = np.moveaxis(np.asarray(q1), -1, 0)
+    w2, x2, y2, z2 = np.moveaxis(np.asarray(q2), -1, 0)
+    return np.stack(
+        [
+            w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        ],
+        axis=-1,
+    )
+
+
+def quaternion_rotate(q: np.ndarray, vec: np.ndarray) -> np.ndarray:
+    """Rotate vectors by unit scalar-first quaternions with broadcasting over leading dimensions."""
+    q = np.asarray(q)
+    u = q[..., 1:]
+    t = 2.0 * np.cross(u, vec)
+    return vec + q[..., :1] * t + np.cross(u, t)
+
+
+def quaternion_to_matrix(q: np.ndarray) -> np.ndarray:
+    """Convert unit scalar-first quaternions with shape (..., 4) into rotation matrices with shape (..., 3, 3)."""
+    w, x, y, z = np.moveaxis(np.asarray(q), -1, 0)
+    mat = np.empty(w.shape + (3, 3))
+    mat[..., 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    mat[..., 0, 1] = 2.0 * (x * y - w * z)
+    mat[..., 0, 2] = 2.0 * (x * z + w * y)
+    mat[..., 1, 0] = 2.0 * (x * y + w * z)
+    mat[..., 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    mat[..., 1, 2] = 2.0 * (y * z - w * x)
+    mat[..., 2, 0] = 2.0 * (x * z - w * y)
+    mat[..., 2, 1] = 2.0 * (y * z + w * x)
+    mat[..., 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return mat
+
+
+def euler_from_matrix(mat: np.ndarray) -> np.ndarray:
+    """Convert rotation matrices into static xyz (roll, pitch, yaw) angles with shape (..., 3)."""
+    m = np.asarray(mat)
+    cy = np.hypot(m[..., 0, 0], m[..., 1, 0])
+    singular = cy <= np.finfo(float).eps * 4.0
+    ax = np.where(singular, np.arctan2(-m[..., 1, 2], m[..., 1, 1]), np.arctan2(m[..., 2, 1], m[..., 2, 2]))
+    ay = np.arctan2(-m[..., 2, 0], cy)
+    az = np.where(singular, 0.0, np.arctan2(m[..., 1, 0], m[..., 0, 0]))
+    return np.stack([ax, ay, az], axis=-1)
+
+
 class Transform:
     """This class calculates the rotation and translation of a 3D rigid body.
 
@@ -15,38 +114,66 @@ class Transform:
         The translation parameter.
     """
 
+    __slots__ = ("rot", "pos")
+
     def __init__(self, rot: Union[List, np.ndarray, None] = None, pos: Optional[np.ndarray] = None) -> None:
         if rot is None:
-            rot = [1.0, 0.0, 0.0, 0.0]
-        if pos is None:
-            pos = np.zeros(3)
-        if len(rot) == 3:
+            self.rot = np.array([1.0, 0.0, 0.0, 0.0])
+        elif len(rot) == 3:
             self.rot = tf.quaternion_from_euler(*rot)
         elif len(rot) == 4:
-            self.rot = np.array(rot)
+            self.rot = np.array(rot, dtype=float)
+            norm = np.sqrt(np.dot(self.rot, self.rot))
+            if norm > 0.0:
+                self.rot /= norm
         else:
             raise ValueError("Size of rot must be 3 or 4.")
-        self.pos = np.array(pos)
+        self.pos = np.zeros(3) if pos is None else np.array(pos, dtype=float)
+
+    @classmethod
+    def _from_arrays(cls, rot: np.ndarray, pos: np.ndarray) -> "Transform":
+        # Trusted construction without validation or copies: `rot` must be a unit quaternion.
+        t = object.__new__(cls)
+        t.rot = rot
+        t.pos = pos
+        return t
 
     def __repr__(self) -> str:
         return "Transform(rot={0}, pos={1})".format(self.rot, self.pos)
 
     @staticmethod
     def _rotation_vec(rot: np.ndarray, vec: np.ndarray) -> np.ndarray:
-        v4 = np.hstack([np.array([0.0]), vec])
-        inv_rot = tf.quaternion_inverse(rot)
-        ans = tf.quaternion_multiply(tf.quaternion_multiply(rot, v4), inv_rot)
-        return ans[1:]
+        # v' = v + 2w(u x v) + 2u x (u x v) for the unit quaternion (w, u).
+        w, x, y, z = rot.tolist()
+        vx, vy, vz = vec.tolist()
+        tx = 2.0 * (y * vz - z * vy)
+        ty = 2.0 * (z * vx - x * vz)
+        tz = 2.0 * (x * vy - y * vx)
+        return np.array(
+            [vx + w * tx + y * tz - z * ty, vy + w * ty + z * tx - x * tz, vz + w * tz + x * ty - y * tx]
+        )
 
     def __mul__(self, other: "Transform") -> "Transform":
-        rot = tf.quaternion_multiply(self.rot, other.rot)
-        pos = self._rotation_vec(self.rot, other.pos) + self.pos
-        return Transform(rot, pos)
+        if not isinstance(other, Transform):
+            return NotImplemented
+        w1, x1, y1, z1 = self.rot.tolist()
+        w2, x2, y2, z2 = other.rot.tolist()
+        rot = np.array(
+            [
+                w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+                w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+            ]
+        )
+        pos = self._rotation_vec(self.rot, other.pos)
+        pos += self.pos
+        return Transform._from_arrays(rot, pos)
 
     def inverse(self) -> "Transform":
-        rot = tf.quaternion_inverse(self.rot)
+        rot = self.rot * np.array([1.0, -1.0, -1.0, -1.0])
         pos = -self._rotation_vec(rot, self.pos)
-        return Transform(rot, pos)
+        return Transform._from_arrays(rot, pos)
 
     def matrix(self) -> np.ndarray:
         mat = tf.quaternion_matrix(self.rot)
@@ -60,3 +187,107 @@ class Transform:
     @property
     def rot_euler(self) -> np.ndarray:
         return tf.euler_from_quaternion(self.rot)
+
+
+class TransformBatch:
+    """A batch of 3D rigid body transforms with vectorized arithmetic.
+
+    The leading dimensions of `rot` and `pos` form the batch shape, e.g. (N,) or (N, n_links).
+    Multiplication broadcasts over the batch shape and against a single `Transform`.
+
+    Attributes
+    ----------
+    rot : np.ndarray
+        Scalar-first unit quaternions with shape (..., 4).
+    pos : np.ndarray
+        Translations with shape (..., 3).
+    """
+
+    __slots__ = ("rot", "pos")
+
+    def __init__(self, rot: np.ndarray, pos: Optional[np.ndarray] = None) -> None:
+        rot = np.array(rot, dtype=float)
+        if rot.ndim == 0 or rot.shape[-1] != 4:
+            raise ValueError("Shape of rot must be (..., 4).")
+        norm = np.sqrt(np.einsum("...i,...i->...", rot, rot))[..., None]
+        self.rot = np.divide(rot, norm, out=rot, where=norm > 0.0)
+        if pos is None:
+            self.pos = np.zeros(rot.shape[:-1] + (3,))
+        else:
+            self.pos = np.array(np.broadcast_to(pos, rot.shape[:-1] + (3,)), dtype=float)
+
+    @classmethod
+    def _from_arrays(cls, rot: np.ndarray, pos: np.ndarray) -> "TransformBatch":
+        # Trusted construction without validation or copies: `rot` must hold unit quaternions.
+        t = object.__new__(cls)
+        t.rot = rot
+        t.pos = pos
+        return t
+
+    @classmethod
+    def from_matrix(cls, mat: np.ndarray) -> "TransformBatch":
+        """Create a batch from homogeneous matrices with shape (..., 4, 4)."""
+        mat = np.asarray(mat, dtype=float)
+        return cls._from_arrays(quaternion_from_matrix(mat), mat[..., :3, 3].copy())
+
+    @classmethod
+    def from_transforms(cls, transforms: List[Transform]) -> "TransformBatch":
+        """Stack a list of transforms into a batch with shape (len(transforms),)."""
+        return cls._from_arrays(np.array([t.rot for t in transforms]), np.array([t.pos for t in transforms]))
+
+    def __repr__(self) -> str:
+        return "TransformBatch(rot={0}, pos={1})".format(self.rot, self.pos)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.rot.shape[:-1]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index: Any) -> Union[Transform, "TransformBatch"]:
+        if not isinstance(index, tuple):
+            index = (index,)
+        rot = self.rot[index + (slice(None),)]
+        pos = self.pos[index + (slice(None),)]
+        if rot.ndim == 1:
+            return Transform._from_arrays(rot, pos)
+        return TransformBatch._from_arrays(rot, pos)
+
+    def __iter__(self) -> Iterator[Union[Transform, "TransformBatch"]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __mul__(self, other: Union[Transform, "TransformBatch"]) -> "TransformBatch":
+        if not isinstance(other, (Transform, TransformBatch)):
+            return NotImplemented
+        rot = quaternion_multiply(self.rot, other.rot)
+        pos = quaternion_rotate(self.rot, other.pos) + self.pos
+        return TransformBatch._from_arrays(rot, pos)
+
+    def __rmul__(self, other: Transform) -> "TransformBatch":
+        if not isinstance(other, Transform):
+            return NotImplemented
+        rot = quaternion_multiply(other.rot, self.rot)
+        pos = quaternion_rotate(other.rot, self.pos) + other.pos
+        return TransformBatch._from_arrays(rot, pos)
+
+    def inverse(self) -> "TransformBatch":
+        rot = self.rot * np.array([1.0, -1.0, -1.0, -1.0])
+        pos = -quaternion_rotate(rot, self.pos)
+        return TransformBatch._from_arrays(rot, pos)
+
+    def matrix(self) -> np.ndarray:
+        mat = np.zeros(self.shape + (4, 4))
+        mat[..., :3, :3] = quaternion_to_matrix(self.rot)
+        mat[..., :3, 3] = self.pos
+        mat[..., 3, 3] = 1.0
+        return mat
+
+    @property
+    def rot_mat(self) -> np.ndarray:
+        return quaternion_to_matrix(self.rot)
+
+    @property
+    def rot_euler(self) -> np.ndarray:
+        return euler_from_matrix(self.rot_mat)
@@ -1,8 +1,10 @@
 import io
-from typing import List, TextIO, Union
+from typing import Any, Dict, List, NamedTuple, TextIO, Tuple, Union
+
+import numpy as np
+from lxml import etree
 
 from . import chain, frame, transform
-from .urdf_parser_py import urdf
 
 JOINT_TYPE_MAP = {"revolute": "revolute", "continuous": "revolute", "prismatic": "prismatic", "fixed": "fixed"}
 
@@ -15,6 +17,8 @@ def _convert_transform(origin) -> transform.Transform:
 
 
 def _convert_visual(visual) -> frame.Visual:
+    from .urdf_parser_py import urdf
+
     if visual is None or visual.geometry is None:
         return frame.Visual()
     else:
@@ -37,21 +41,195 @@ def _convert_visual(visual) -> frame.Visual:
         return frame.Visual(v_tf, g_type, g_param)
 
 
-def _build_chain_recurse(root_frame, lmap, joints) -> List[frame.Frame]:
-    children = []
-    for j in joints:
-        if j.parent == root_frame.link.name:
-            child_frame = frame.Frame(j.child + "_frame")
-            child_frame.joint = frame.Joint(
-                j.name, offset=_convert_transform(j.origin), joint_type=JOINT_TYPE_MAP[j.type], axis=j.axis
-            )
-            link = lmap[j.child]
-            child_frame.link = frame.Link(
-                link.name, offset=_convert_transform(link.origin), visuals=[_convert_visual(link.visual)]
+def _inertial_kwargs(origin: transform.Transform, mass: float, inertia: Any) -> Dict[str, Any]:
+    """Link inertial parameters, with the inertia tensor rotated from the inertial frame into the link frame."""
+    rot = origin.rot_mat
+    return {"mass": mass, "com": origin.pos, "inertia": rot @ np.asarray(inertia, dtype=float) @ rot.T}
+
+
+def _convert_inertial(inertial) -> Dict[str, Any]:
+    if inertial is None:
+        return {}
+    inertia = np.zeros((3, 3)) if inertial.inertia is None else inertial.inertia.to_matrix()
+    return _inertial_kwargs(_convert_transform(inertial.origin), float(inertial.mass or 0.0), inertia)
+
+
+def _convert_limit_kwargs(joint) -> Dict[str, Any]:
+    limit = joint.limit
+    if limit is None:
+        return {}
+    kwargs = {"velocity_limit": limit.velocity, "effort_limit": limit.effort}
+    if joint.type in ("revolute", "prismatic"):
+        kwargs["limits"] = (limit.lower, limit.upper)
+    return kwargs
+
+
+class _JointSpec(NamedTuple):
+    name: str
+    parent: str
+    child: str
+    joint: frame.Joint
+
+
+class _UnsupportedURDF(Exception):
+    """Raised by the direct parser for input it does not handle, so that the reflection parser is used instead."""
+
+
+def _required(node, name: str) -> str:
+    value = node.get(name)
+    if value is None:
+        raise _UnsupportedURDF("Missing attribute %s in <%s>." % (name, node.tag))
+    return value
+
+
+def _floats(text: str, count: int) -> List[float]:
+    values = [float(v) for v in text.split()]
+    if len(values) != count:
+        raise _UnsupportedURDF("Invalid vector length.")
+    return values
+
+
+def _parse_origin(node) -> transform.Transform:
+    if node is None:
+        return transform.Transform()
+    return transform.Transform(
+        rot=_floats(node.get("rpy", "0 0 0"), 3), pos=np.array(_floats(node.get("xyz", "0 0 0"), 3))
+    )
+
+
+def _parse_visual(node) -> frame.Visual:
+    if node is None:
+        return frame.Visual()
+    geometry = node.find("geometry")
+    if geometry is None:
+        raise _UnsupportedURDF("Visual without geometry.")
+    shapes = [c for c in geometry if isinstance(c.tag, str)]
+    if len(shapes) != 1:
+        raise _UnsupportedURDF("One element only for geometric.")
+    shape = shapes[0]
+    g_param: Any
+    if shape.tag == "mesh":
+        g_param = _required(shape, "filename")
+    elif shape.tag == "cylinder":
+        g_param = (float(_required(shape, "radius")), float(_required(shape, "length")))
+    elif shape.tag == "box":
+        g_param = _floats(_required(shape, "size"), 3)
+    elif shape.tag == "sphere":
+        g_param = float(_required(shape, "radius"))
+    else:
+        raise _UnsupportedURDF("Unknown geometry %s." % shape.tag)
+    return frame.Visual(_parse_origin(node.find("origin")), shape.tag, g_param)
+
+
+def _parse_inertial(node) -> Dict[str, Any]:
+    if node is None:
+        return {}
+    mass = node.find("mass")
+    inertia = np.zeros((3, 3))
+    tensor = node.find("inertia")
+    if tensor is not None:
+        ixx, ixy, ixz, iyy, iyz, izz = [float(tensor.get(k, 0.0)) for k in ("ixx", "ixy", "ixz", "iyy", "iyz", "izz")]
+        inertia = np.array([[ixx, ixy, ixz], [ixy, iyy, iyz], [ixz, iyz, izz]])
+    return _inertial_kwargs(
+        _parse_origin(node.find("origin")), 0.0 if mass is None else float(_required(mass, "value")), inertia
+    )
+
+
+def _parse_joint(node) -> _JointSpec:
+    joint_type = _required(node, "type")
+    if joint_type not in JOINT_TYPE_MAP:
+        raise _UnsupportedURDF("Unsupported joint type %s." % joint_type)
+    parent = node.find("parent")
+    child = node.find("child")
+    if parent is None or child is None:
+        raise _UnsupportedURDF("Joint without parent or child link.")
+    axis = node.find("axis")
+    kwargs: Dict[str, Any] = {}
+    limit = node.find("limit")
+    if limit is not None:
+        kwargs["velocity_limit"] = float(_required(limit, "velocity"))
+        kwargs["effort_limit"] = float(_required(limit, "effort"))
+        if joint_type in ("revolute", "prismatic"):
+            kwargs["limits"] = (float(limit.get("lower", 0.0)), float(limit.get("upper", 0.0)))
+    name = _required(node, "name")
+    return _JointSpec(
+        name,
+        _required(parent, "link"),
+        _required(child, "link"),
+        frame.Joint(
+            name,
+            offset=_parse_origin(node.find("origin")),
+            joint_type=JOINT_TYPE_MAP[joint_type],
+            axis=None if axis is None else _floats(_required(axis, "xyz"), 3),
+            **kwargs,
+        ),
+    )
+
+
+def _parse_urdf(data) -> Tuple[Dict[str, frame.Link], List[_JointSpec]]:
+    """Read links and joints directly from the lxml tree, without building the reflection object model."""
+    root = etree.fromstring(data.encode("utf-8") if isinstance(data, str) else data)
+    if root.tag != "robot":
+        raise _UnsupportedURDF("Root element is not <robot>.")
+    links: Dict[str, frame.Link] = {}
+    joints: List[_JointSpec] = []
+    for node in root:
+        if node.tag == "link":
+            name = _required(node, "name")
+            links[name] = frame.Link(
+                name,
+                offset=_parse_origin(node.find("origin")),
+                visuals=[_parse_visual(node.find("visual"))],
+                **_parse_inertial(node.find("inertial")),
             )
-            child_frame.children = _build_chain_recurse(child_frame, lmap, joints)
-            children.append(child_frame)
-    return children
+        elif node.tag == "joint":
+            joints.append(_parse_joint(node))
+    return links, joints
+
+
+def _convert_robot(data) -> Tuple[Dict[str, frame.Link], List[_JointSpec]]:
+    """Parse with the reflection parser and convert its object model."""
+    from .urdf_parser_py import urdf
+
+    robot = urdf.URDF.from_xml_string(data)
+    links = {
+        link.name: frame.Link(
+            link.name,
+            offset=_convert_transform(link.origin),
+            visuals=[_convert_visual(link.visual)],
+            **_convert_inertial(link.inertial),
+        )
+        for link in robot.links
+    }
+    joints = [
+        _JointSpec(
+            j.name,
+            j.parent,
+            j.child,
+            frame.Joint(
+                j.name,
+                offset=_convert_transform(j.origin),
+                joint_type=JOINT_TYPE_MAP[j.type],
+                axis=j.axis,
+                **_convert_limit_kwargs(j),
+            ),
+        )
+        for j in robot.joints
+    ]
+    return links, joints
+
+
+def _build_chain(links: Dict[str, frame.Link], joints: List[_JointSpec]) -> chain.Chain:
+    root_name, child_joints = chain._index_joints(list(links), joints)
+    root_frame = frame.Frame(root_name + "_frame")
+    root_frame.joint = frame.Joint()
+    root_frame.link = links[root_name]
+
+    def make_frame(parent_frame: frame.Frame, j: _JointSpec) -> frame.Frame:
+        return frame.Frame(j.child + "_frame", link=links[j.child], joint=j.joint)
+
+    chain._build_tree(root_frame, child_joints, len(joints), make_frame)
+    return chain.Chain(root_frame)
 
 
 def build_chain_from_urdf(data: Union[str, TextIO]) -> chain.Chain:
@@ -87,28 +265,11 @@ def build_chain_from_urdf(data: Union[str, TextIO]) -> chain.Chain:
     """
     if isinstance(data, io.TextIOBase):
         data = data.read()
-    robot = urdf.URDF.from_xml_string(data)
-    lmap = robot.link_map
-    joints = robot.joints
-    n_joints = len(joints)
-    has_root = [True for _ in range(len(joints))]
-    for i in range(n_joints):
-        for j in range(i + 1, n_joints):
-            if joints[i].parent == joints[j].child:
-                has_root[i] = False
-            elif joints[j].parent == joints[i].child:
-                has_root[j] = False
-    for i in range(n_joints):
-        if has_root[i]:
-            root_link = lmap[joints[i].parent]
-            break
-    root_frame = frame.Frame(root_link.name + "_frame")
-    root_frame.joint = frame.Joint()
-    root_frame.link = frame.Link(
-        root_link.name, _convert_transform(root_link.origin), [_convert_visual(root_link.visual)]
-    )
-    root_frame.children = _build_chain_recurse(root_frame, lmap, joints)
-    return chain.Chain(root_frame)
+    try:
+        links, joints = _parse_urdf(data)
+    except (_UnsupportedURDF, ValueError, etree.XMLSyntaxError):
+        links, joints = _convert_robot(data)
+    return _build_chain(links, joints)
 
 
 def build_serial_chain_from_urdf(
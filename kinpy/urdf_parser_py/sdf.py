@@ -156,12 +156,23 @@ xmlr.reflect(
 
 
 class Limit(xmlr.Object):
-    def __init__(self, lower=None, upper=None):
+    def __init__(self, lower=None, upper=None, effort=None, velocity=None):
         self.lower = lower
         self.upper = upper
+        self.effort = effort
+        self.velocity = velocity
 
 
-xmlr.reflect(Limit, tag="limit", params=[xmlr.Element("lower", float, False), xmlr.Element("upper", float, False)])
+xmlr.reflect(
+    Limit,
+    tag="limit",
+    params=[
+        xmlr.Element("lower", float, False),
+        xmlr.Element("upper", float, False),
+        xmlr.Element("effort", float, False),
+        xmlr.Element("velocity", float, False),
+    ],
+)
 
 
 class Axis(xmlr.Object):
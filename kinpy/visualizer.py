@@ -9,8 +9,9 @@ import vtk
 from vtk.util.colors import tomato
 
 from . import transform
-from .chain import Chain
+from .chain import Chain, SerialChain
 from .frame import Visual
+from .state import KinematicState
 
 
 class Visualizer:
@@ -185,20 +186,18 @@ class JointAngleEditor(Visualizer):
         if isinstance(initial_state, (list, np.ndarray)):
             initial_state = {k: v for k, v in zip(self._chain.get_joint_parameter_names(), initial_state)}
         self._joint_angles: Dict[str, float] = initial_state
+        # A serial chain only covers the links on its path; draw the whole tree below its root.
+        self._state = KinematicState(chain._tree if isinstance(chain, SerialChain) else chain, self._joint_angles)
         self._visuals_map = self._chain.visuals_map()
-        self.add_robot(
-            self._chain.forward_kinematics(self._joint_angles, end_only=False),  # type: ignore
-            self._visuals_map,
-            mesh_file_path,
-            axes,
-        )
+        self.add_robot(self._state.link_transforms(), self._visuals_map, mesh_file_path, axes)
         self._sliders = self._set_joint_slider(chain)
 
     def _update_joint_angle(self, obj: vtk.vtkSliderWidget, event: str, joint_name: str) -> None:
         slider_rep = obj.GetRepresentation()
         self._joint_angles[joint_name] = np.deg2rad(slider_rep.GetValue())
-        positions = self._chain.forward_kinematics(self._joint_angles, end_only=False)  # type: ignore
-        for k, position in positions.items():
+        # Only the links below the moved joint need their actors updated.
+        for k in self._state.set_joint_positions({joint_name: self._joint_angles[joint_name]}):
+            position = self._state.link_transform(k)
             if k in self._axes:
                 transform = vtk.vtkTransform()
                 transform.Translate(position.pos)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+import os
+import subprocess
+import sys
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT = "import time; t = time.perf_counter(); import kinpy; print(time.perf_counter() - t)"
+SCHEMA = (
+    "import time; import kinpy; from kinpy.mjcf_parser import schema; "
+    "t = time.perf_counter(); schema.MUJOCO; print(time.perf_counter() - t)"
+)
+
+
+def _measure(code: str, repeat: int) -> float:
+    """Best time reported by a snippet over several fresh interpreters."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    times = [float(subprocess.check_output([sys.executable, "-c", code], env=env, cwd=ROOT)) for _ in range(repeat)]
+    return min(times)
+
+
+def main(args: Any) -> None:
+    from kinpy.mjcf_parser import schema
+
+    pickle_path = os.path.join(ROOT, "kinpy", "mjcf_parser", "schema.pkl")
+    print("import kinpy:               %7.1f ms" % (_measure(IMPORT, args.repeat) * 1e3))
+    # Set aside an existing pickle (e.g. from 'make schema') and put it back afterwards.
+    backup_path = pickle_path + ".bak"
+    if os.path.exists(pickle_path):
+        os.replace(pickle_path, backup_path)
+    try:
+        print("MJCF schema (from XML):     %7.1f ms" % (_measure(SCHEMA, args.repeat) * 1e3))
+        schema.compile_schema(pickle_path)
+        print("MJCF schema (precompiled):  %7.1f ms" % (_measure(SCHEMA, args.repeat) * 1e3))
+    finally:
+        if os.path.exists(backup_path):
+            os.replace(backup_path, pickle_path)
+        elif not args.keep and os.path.exists(pickle_path):
+            os.remove(pickle_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    sys.path.insert(0, ROOT)
+    parser = argparse.ArgumentParser(description="Import and MJCF schema loading benchmark.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of fresh interpreters per measurement.")
+    parser.add_argument("--keep", action="store_true", help="Keep the compiled schema.pkl if none existed.")
+    args = parser.parse_args()
+    main(args)
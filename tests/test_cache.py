@@ -0,0 +1,69 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import kinpy as kp
+
+
+class TestCache(unittest.TestCase):
+    def test_cached_chain(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            chain = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf", cache_dir=cache_dir)
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+            cached = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf", cache_dir=cache_dir)
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+            th = np.random.rand(7)
+            ret, ret_cached = chain.forward_kinematics(th), cached.forward_kinematics(th)
+            for name, tf in ret.items():
+                np.testing.assert_allclose(tf.matrix(), ret_cached[name].matrix())
+
+    def test_stale_layout(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            key = kp.cache.cache_key(open("examples/kuka_iiwa/model.urdf").read(), "urdf")
+            chain = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf", cache_dir=cache_dir)
+            self.assertIsNotNone(kp.cache.load_chain(cache_dir, key))
+            # An entry written by another version of kinpy is a cache miss.
+            with open(os.path.join(cache_dir, key + ".pkl"), "wb") as f:
+                pickle.dump(("0" * 64, chain), f)
+            self.assertIsNone(kp.cache.load_chain(cache_dir, key))
+            with open(os.path.join(cache_dir, key + ".pkl"), "wb") as f:
+                pickle.dump(chain, f)
+            self.assertIsNone(kp.cache.load_chain(cache_dir, key))
+            cached = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf", cache_dir=cache_dir)
+            self.assertIsNotNone(kp.cache.load_chain(cache_dir, key))
+            th = np.random.rand(7)
+            np.testing.assert_allclose(chain.mass_matrix(th), cached.mass_matrix(th))
+
+    def test_key_parser_source(self):
+        data = open("examples/kuka_iiwa/model.urdf").read()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            package_dirs = [os.path.join(tmp_dir, name) for name in ("a", "b")]
+            for package_dir in package_dirs:
+                shutil.copytree(kp.cache._PACKAGE_DIR, package_dir, ignore=shutil.ignore_patterns("__pycache__"))
+            with open(os.path.join(package_dirs[1], "mjcf.py"), "a") as f:
+                f.write("\n# changed\n")
+            keys = []
+            for package_dir in package_dirs:
+                with mock.patch.object(kp.cache, "_PACKAGE_DIR", package_dir):
+                    keys.append(kp.cache.cache_key(data, "urdf"))
+            self.assertNotEqual(keys[0], keys[1])
+            with mock.patch.object(kp.cache, "_PACKAGE_DIR", package_dirs[0]):
+                self.assertEqual(keys[0], kp.cache.cache_key(data, "urdf"))
+
+    def test_key_includes(self):
+        with tempfile.TemporaryDirectory() as model_dir:
+            data = '<mujoco><include file="body.xml"/></mujoco>'
+            with open(os.path.join(model_dir, "body.xml"), "w") as f:
+                f.write("<mujoco><worldbody/></mujoco>")
+            key = kp.cache.cache_key(data, "mjcf", model_dir)
+            self.assertEqual(key, kp.cache.cache_key(data, "mjcf", model_dir))
+            with open(os.path.join(model_dir, "body.xml"), "w") as f:
+                f.write('<mujoco><worldbody><body name="b"/></worldbody></mujoco>')
+            self.assertNotEqual(key, kp.cache.cache_key(data, "mjcf", model_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+
+import numpy as np
+
+import kinpy as kp
+
+PENDULUM = """<robot name="pendulum">
+  <link name="base"/>
+  <link name="arm">
+    <inertial>
+      <origin xyz="1.0 0.0 0.0"/>
+      <mass value="2.0"/>
+      <inertia ixx="0.01" ixy="0.0" ixz="0.0" iyy="0.1" iyz="0.0" izz="0.1"/>
+    </inertial>
+  </link>
+  <joint name="hinge" type="revolute">
+    <parent link="base"/>
+    <child link="arm"/>
+    <axis xyz="0 1 0"/>
+  </joint>
+</robot>"""
+
+
+class TestDynamics(unittest.TestCase):
+    def test_link_inertia(self):
+        chain = kp.build_chain_from_urdf(PENDULUM)
+        link = chain.find_link("arm")
+        self.assertEqual(link.mass, 2.0)
+        np.testing.assert_equal(link.com, [1.0, 0.0, 0.0])
+        np.testing.assert_equal(np.diag(link.inertia), [0.01, 0.1, 0.1])
+        self.assertEqual(chain.find_link("base").mass, 0.0)
+        # Inertia of the MuJoCo humanoid computed from its geoms.
+        humanoid = kp.build_chain_from_file("examples/humanoid/humanoid.xml").compile()
+        self.assertAlmostEqual(humanoid.masses.sum(), 40.844, places=3)
+
+    def test_pendulum(self):
+        chain = kp.build_chain_from_urdf(PENDULUM)
+        q, qd, qdd = 0.3, 1.5, -2.0
+        tau = chain.inverse_dynamics([q], [qd], [qdd])
+        np.testing.assert_allclose(tau, [(0.1 + 2.0) * qdd - 2.0 * 9.81 * np.cos(q)])
+        tau = chain.inverse_dynamics([q], [qd], [qdd], gravity=np.zeros(3))
+        np.testing.assert_allclose(tau, [(0.1 + 2.0) * qdd])
+
+    def test_inverse_dynamics_batch(self):
+        chain = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf")
+        serial = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        rng = np.random.default_rng(0)
+        q, qd, qdd = rng.uniform(-1.0, 1.0, (3, 10, chain.dof))
+        tau = chain.inverse_dynamics(q, qd, qdd)
+        self.assertEqual(tau.shape, (10, chain.dof))
+        for i in range(10):
+            np.testing.assert_allclose(tau[i], chain.inverse_dynamics(q[i], qd[i], qdd[i]))
+        np.testing.assert_allclose(serial.inverse_dynamics(q, qd, qdd), tau)
+
+    def test_mass_matrix(self):
+        chain = kp.build_chain_from_file("examples/humanoid/humanoid.xml")
+        rng = np.random.default_rng(1)
+        q, qd, qdd = rng.uniform(-1.0, 1.0, (3, 4, chain.dof))
+        mass = chain.mass_matrix(q)
+        self.assertEqual(mass.shape, (4, chain.dof, chain.dof))
+        np.testing.assert_allclose(mass, np.swapaxes(mass, -1, -2))
+        self.assertTrue(np.all(np.linalg.eigvalsh(mass) > 0.0))
+        columns = [chain.inverse_dynamics(q, np.zeros(chain.dof), e, gravity=np.zeros(3)) for e in np.eye(chain.dof)]
+        np.testing.assert_allclose(mass, np.stack(columns, axis=-1), atol=1e-12)
+        tau = chain.inverse_dynamics(q, qd, qdd)
+        bias = chain.bias_forces(q, qd)
+        np.testing.assert_allclose(np.einsum("nij,nj->ni", mass, qdd) + bias, tau, atol=1e-12)
+        gravity = chain.gravity_torques(q)
+        np.testing.assert_allclose(gravity, chain.inverse_dynamics(q, np.zeros(chain.dof), np.zeros(chain.dof)))
+        np.testing.assert_allclose(chain.gravity_torques(q, gravity=np.zeros(3)), np.zeros((4, chain.dof)))
+        np.testing.assert_allclose(chain.mass_matrix(q[0]), mass[0])
+
+    def test_forward_dynamics(self):
+        chain = kp.build_chain_from_file("examples/humanoid/humanoid.xml")
+        rng = np.random.default_rng(2)
+        q, qd, tau = rng.uniform(-1.0, 1.0, (3, 4, chain.dof))
+        qdd = chain.forward_dynamics(q, qd, tau)
+        self.assertEqual(qdd.shape, (4, chain.dof))
+        np.testing.assert_allclose(chain.inverse_dynamics(q, qd, qdd), tau, atol=1e-9)
+        np.testing.assert_allclose(chain.forward_dynamics(q[0], qd[0], tau[0]), qdd[0])
+
+    def test_rollout(self):
+        chain = kp.build_chain_from_urdf(PENDULUM)
+        q0 = np.array([[0.0], [0.5], [1.0]])
+        q, qd = chain.rollout(q0, np.zeros_like(q0), np.zeros((2000, 3, 1)), dt=1e-4)
+        self.assertEqual(q.shape, (2000, 3, 1))
+        # Energy of the swinging pendulum is conserved up to the integration error.
+        inertia, mgl = 2.1, 2.0 * 9.81
+        energy = 0.5 * inertia * qd**2 - mgl * np.sin(q)
+        np.testing.assert_allclose(energy, np.broadcast_to(energy[0], energy.shape), atol=1e-2)
+        np.testing.assert_allclose(qd[0], 1e-4 * chain.forward_dynamics(q0, np.zeros_like(q0), np.zeros_like(q0)))
+
+    def test_center_of_mass(self):
+        chain = kp.build_chain_from_file("examples/ant/ant.xml")
+        comp = chain.compile()
+        rng = np.random.default_rng(3)
+        q = rng.uniform(-1.0, 1.0, (5, chain.dof))
+        mats = chain.link_matrices(q)
+        link_coms = np.array([f.link.com for f in comp.frames])
+        coms = np.einsum("bnij,nj->bni", mats[..., :3, :3], link_coms) + mats[..., :3, 3]
+        expected = np.einsum("n,bni->bi", comp.masses, coms) / comp.masses.sum()
+        np.testing.assert_allclose(chain.center_of_mass(q), expected)
+        jac, com = chain.com_jacobian(q, return_com=True)
+        self.assertEqual(jac.shape, (5, 3, chain.dof))
+        np.testing.assert_allclose(com, expected)
+        eps = 1e-6
+        numerical = [(chain.center_of_mass(q + eps * e) - chain.center_of_mass(q - eps * e)) / (2.0 * eps)
+                     for e in np.eye(chain.dof)]
+        np.testing.assert_allclose(jac, np.stack(numerical, axis=-1), atol=1e-8)
+        np.testing.assert_allclose(chain.com_jacobian(q[0]), jac[0])
+
+    def test_forward_kinematics_derivatives(self):
+        chain = kp.build_chain_from_file("examples/humanoid/humanoid.xml")
+        rng = np.random.default_rng(4)
+        q, qd, qdd = rng.uniform(-1.0, 1.0, (3, 2, chain.dof))
+        poses, twists, accelerations = chain.forward_kinematics_derivatives(q, qd, qdd)
+        np.testing.assert_allclose(poses, chain.link_matrices(q))
+        names = chain.get_link_names()
+        jacs = chain.jacobian(q, names)
+        np.testing.assert_allclose(twists, np.einsum("bnkd,bd->bnk", jacs, qd), atol=1e-12)
+        eps = 1e-6
+        jac_dot = (chain.jacobian(q + eps * qd, names) - chain.jacobian(q - eps * qd, names)) / (2.0 * eps)
+        expected = np.einsum("bnkd,bd->bnk", jacs, qdd) + np.einsum("bnkd,bd->bnk", jac_dot, qd)
+        np.testing.assert_allclose(accelerations, expected, atol=1e-8)
+        poses, twists, accelerations = chain.forward_kinematics_derivatives(q[0], qd[0])
+        self.assertIsNone(accelerations)
+        self.assertEqual(twists.shape, (len(names), 6))
+
+
+if __name__ == "__main__":
+    unittest.main()
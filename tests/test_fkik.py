@@ -1,3 +1,4 @@
+import importlib
 import unittest
 import numpy as np
 import kinpy as kp
@@ -25,7 +26,167 @@ class TestFkIk(unittest.TestCase):
         tg = chain.forward_kinematics(th1)
         th2 = chain.inverse_kinematics(tg)
         self.assertTrue(np.allclose(th1, th2, atol=1.0e-6))
-        
+
+    def test_ik_dls(self):
+        chain = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        th = np.random.uniform(-1.0, 1.0, 7)
+        tg = chain.forward_kinematics(th)
+        ret = chain.inverse_kinematics_dls(tg, initial_state=th + np.random.uniform(-0.2, 0.2, 7))
+        self.assertTrue(ret.converged)
+        self.assertLess(ret.error, 1.0e-6)
+        np.testing.assert_allclose(tg.matrix(), chain.forward_kinematics(ret.solution).matrix(), atol=1.0e-5)
+        initial_state = th + np.random.uniform(-0.2, 0.2, 7)
+        ret = chain.inverse_kinematics_dls(tg, initial_state=initial_state, damping=1.0)
+        expected = kp.ik.inverse_kinematics_dls(chain, tg, initial_state=initial_state, damping=1.0)
+        np.testing.assert_equal(expected.solution, ret.solution)
+
+    def test_ik_dls_batch(self):
+        chain = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        ths = np.random.uniform(-1.0, 1.0, (20, 7))
+        tgs = chain.forward_kinematics_batch(ths)
+        ret = chain.inverse_kinematics_dls_batch(tgs, initial_states=ths + np.random.uniform(-0.2, 0.2, (20, 7)))
+        self.assertEqual((20, 7), ret.solutions.shape)
+        self.assertTrue(ret.success.all())
+        self.assertTrue((ret.residuals < 1.0e-6).all())
+        np.testing.assert_allclose(tgs.matrix(), chain.forward_kinematics_batch(ret.solutions).matrix(), atol=1.0e-5)
+
+    def test_joint_limits(self):
+        chain = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf")
+        lower, upper = chain.get_joint_limits()
+        np.testing.assert_allclose(-2.96705972839, lower[0])
+        np.testing.assert_allclose(2.09439510239, upper[1])
+        self.assertEqual(10.0, chain.find_frame("lbr_iiwa_link_1_frame").joint.velocity_limit)
+
+        chain = kp.build_chain_from_file("examples/simple_arm/model.sdf")
+        lower, upper = chain.get_joint_limits()
+        self.assertEqual((-0.8, 0.1), (lower[2], upper[2]))
+
+        chain = kp.build_chain_from_file("examples/ant/ant.xml")
+        lower, upper = chain.get_joint_limits()
+        np.testing.assert_allclose(np.deg2rad([-40.0, 40.0]), [lower[0], upper[0]])
+        np.testing.assert_allclose(np.deg2rad([30.0, 100.0]), [lower[1], upper[1]])
+
+    def test_fk_batch(self):
+        chain = kp.build_chain_from_file("examples/humanoid/humanoid.xml")
+        ths = np.random.rand(5, chain.dof) * 2.0 * np.pi - np.pi
+        mats = chain.forward_kinematics_batch(ths).matrix()
+        link_names = chain.get_link_names()
+        self.assertEqual((5, len(link_names), 4, 4), mats.shape)
+        for th, mat in zip(ths, mats):
+            ret = chain.forward_kinematics(th)
+            for name, m in zip(link_names, mat):
+                np.testing.assert_allclose(ret[name].matrix(), m, atol=1.0e-8)
+
+    def test_compiled_chain_rebuilt_on_add_frame(self):
+        chain = kp.build_chain_from_file("examples/kuka_iiwa/model.urdf")
+        compiled = chain.compile()
+        self.assertIs(compiled, chain.compile())
+        self.assertEqual(-1, compiled.parents[0])
+        self.assertEqual(7, chain.dof)
+        tool = kp.frame.Frame(
+            "tool_frame",
+            link=kp.frame.Link("tool"),
+            joint=kp.frame.Joint("tool_joint", offset=kp.Transform(pos=[0.0, 0.0, 0.1]), joint_type="revolute"),
+        )
+        chain.add_frame(tool, "lbr_iiwa_link_7_frame")
+        self.assertIsNot(compiled, chain.compile())
+        self.assertEqual(8, chain.dof)
+        ret = chain.forward_kinematics(np.zeros(8))
+        expected = ret["lbr_iiwa_link_7"] * kp.Transform(pos=[0.0, 0.0, 0.1])
+        np.testing.assert_allclose(expected.pos, ret["tool"].pos, atol=1.0e-8)
+
+    def test_name_indexes(self):
+        chain = kp.build_chain_from_file("examples/humanoid/humanoid.xml")
+        self.assertEqual("right_knee", chain.find_frame("right_knee_joint_frame").joint.name)
+        self.assertEqual("torso", chain.find_link("torso").name)
+        self.assertIsNone(chain.find_frame("no_such_frame"))
+        self.assertEqual(chain.get_joint_parameter_names().index("left_knee"), chain.get_joint_index("left_knee"))
+        self.assertEqual(chain.get_link_names().index("left_foot"), chain.get_link_index("left_foot"))
+        with self.assertRaises(ValueError):
+            chain.get_joint_index("no_such_joint")
+
+    def test_serial_fk_batch(self):
+        chain = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        ths = np.random.rand(5, 7) * 2.0 * np.pi - np.pi
+        mats = chain.forward_kinematics_batch(ths).matrix()
+        self.assertEqual((5, 4, 4), mats.shape)
+        for th, mat in zip(ths, mats):
+            np.testing.assert_allclose(chain.forward_kinematics(th).matrix(), mat, atol=1.0e-8)
+
+    def test_serial_fk_dict(self):
+        data = open("examples/kuka_iiwa/model.urdf").read()
+        chain = kp.build_serial_chain_from_urdf(data, "lbr_iiwa_link_4")
+        tree = kp.build_chain_from_urdf(data)
+        # Joint values by name give the transforms of every link below the root, as for a Chain.
+        th = {"lbr_iiwa_joint_2": 0.5, "lbr_iiwa_joint_6": -0.3}
+        ret = chain.forward_kinematics(th, end_only=False)
+        expected = tree.forward_kinematics(th)
+        self.assertEqual(list(expected), list(ret))
+        for name, tf in expected.items():
+            np.testing.assert_allclose(tf.matrix(), ret[name].matrix(), atol=1.0e-12)
+        np.testing.assert_allclose(expected["lbr_iiwa_link_4"].matrix(), chain.forward_kinematics(th).matrix())
+        self.assertEqual(5, len(chain.forward_kinematics(np.zeros(4), end_only=False)))
+
+    def test_urdf_tree_checks(self):
+        links = "".join('<link name="l%d"/>' % i for i in range(4))
+        joint = '<joint name="%s" type="fixed"><parent link="%s"/><child link="%s"/></joint>'
+        with self.assertRaises(ValueError):
+            kp.build_chain_from_urdf(
+                '<robot name="r">' + links + joint % ("j1", "l0", "l1") + joint % ("j2", "l2", "l3") + "</robot>"
+            )
+        with self.assertRaises(ValueError):
+            kp.build_chain_from_urdf(
+                '<robot name="r">' + links + joint % ("j1", "l0", "l1") + joint % ("j2", "l1", "l0") + "</robot>"
+            )
+        n = 2000
+        links = "".join('<link name="l%d"/>' % i for i in range(n + 1))
+        joints = "".join(joint % ("j%d" % i, "l%d" % i, "l%d" % (i + 1)) for i in range(n))
+        chain = kp.build_chain_from_urdf('<robot name="r">' + links + joints + "</robot>")
+        self.assertEqual(n + 1, len(chain.get_link_names()))
+
+    def test_urdf_direct_parser(self):
+        urdf = importlib.import_module("kinpy.urdf")
+        data = open("examples/kuka_iiwa/model.urdf").read()
+        fast = urdf._build_chain(*urdf._parse_urdf(data))
+        slow = urdf._build_chain(*urdf._convert_robot(data))
+        self.assertEqual(fast.get_joint_parameter_names(), slow.get_joint_parameter_names())
+        th = np.random.rand(7)
+        for name, tf in fast.forward_kinematics(th).items():
+            np.testing.assert_allclose(slow.forward_kinematics(th)[name].matrix(), tf.matrix(), atol=1.0e-12)
+        chain = kp.build_chain_from_file("examples/SO101/so101_new_calib.urdf")
+        self.assertEqual(6, len(chain.get_joint_parameter_names()))
+
+    def test_kinematic_state(self):
+        chain = kp.build_chain_from_file("examples/humanoid/humanoid.xml")
+        names = chain.get_joint_parameter_names()
+        state = kp.KinematicState(chain)
+        th = np.zeros(len(names))
+        self.assertEqual(["left_foot_child_child"], state.set_joint_positions({"left_ankle_x": 0.3}))
+        th[names.index("left_ankle_x")] = 0.3
+        self.assertEqual([], state.set_joint_positions({"left_ankle_x": 0.3}))
+        for _ in range(10):
+            i = np.random.randint(len(names))
+            th[i] = np.random.rand()
+            state.set_joint_positions({names[i]: th[i]})
+            expected = chain.forward_kinematics(th)
+            for name, tf in state.link_transforms().items():
+                np.testing.assert_allclose(expected[name].matrix(), tf.matrix(), atol=1.0e-10)
+        np.testing.assert_allclose(th, state.q)
+
+    def test_fk_links(self):
+        chain = kp.build_chain_from_file("examples/humanoid/humanoid.xml")
+        links = ["left_foot", "right_lower_arm"]
+        th = np.random.rand(5, len(chain.get_joint_parameter_names()))
+        world = kp.Transform(pos=[0.0, 0.0, 1.0])
+        ret = chain.forward_kinematics(th[0], world=world, links=links)
+        self.assertEqual(links, list(ret))
+        expected = chain.forward_kinematics(th[0], world=world)
+        for name in links:
+            np.testing.assert_allclose(expected[name].matrix(), ret[name].matrix(), atol=1.0e-12)
+        mats = chain.forward_kinematics_batch(th, links=links).matrix()
+        indices = [chain.get_link_index(name) for name in links]
+        np.testing.assert_allclose(chain.forward_kinematics_batch(th).matrix()[:, indices], mats, atol=1.0e-12)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -65,5 +65,104 @@ class TestJacobian(unittest.TestCase):
                                                  [0, 1, 0, -1, 0, 1, 0],
                                                  [1, 0, 7.07106781e-01, 0, -7.07106781e-01, 0, 0]]), jc)
 
+    def test_jacobian_with_pose(self):
+        chain = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        th = np.random.rand(7)
+        jc, pose = chain.jacobian(th, return_pose=True)
+        np.testing.assert_allclose(chain.jacobian(th), jc)
+        np.testing.assert_allclose(chain.forward_kinematics(th).matrix(), pose.matrix(), atol=1.0e-12)
+        # Linear rows match finite differences of the end position.
+        eps = 1.0e-6
+        for i in range(7):
+            dth = np.zeros(7)
+            dth[i] = eps
+            dpos = chain.forward_kinematics(th + dth).pos - chain.forward_kinematics(th - dth).pos
+            np.testing.assert_allclose(dpos / (2.0 * eps), jc[:3, i], atol=1.0e-6)
+
+    def test_jacobian_tool(self):
+        chain = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        tool = kp.Transform(rot=[0.3, -0.5, 0.8], pos=[0.1, 0.05, 0.2])
+        th = np.random.rand(7)
+        jc = kp.jacobian.calc_jacobian(chain, th, tool)
+        # Both the linear and the angular rows match finite differences of the tool pose.
+        eps = 1.0e-6
+        for i in range(7):
+            dth = np.zeros(7)
+            dth[i] = eps
+            plus = (chain.forward_kinematics(th + dth) * tool).matrix()
+            minus = (chain.forward_kinematics(th - dth) * tool).matrix()
+            np.testing.assert_allclose((plus[:3, 3] - minus[:3, 3]) / (2.0 * eps), jc[:3, i], atol=1.0e-6)
+            skew = (plus[:3, :3] - minus[:3, :3]) @ plus[:3, :3].T / (2.0 * eps)
+            np.testing.assert_allclose([skew[2, 1], skew[0, 2], skew[1, 0]], jc[3:, i], atol=1.0e-6)
+
+    def test_link_jacobians(self):
+        chain = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        th = np.random.rand(7)
+        jacs = chain.link_jacobians(th)
+        self.assertEqual((8, 6, 7), jacs.shape)
+        np.testing.assert_allclose(chain.jacobian(th), jacs[-1])
+        for name, jac in chain.jacobian(th, end_only=False).items():
+            np.testing.assert_allclose(jac, jacs[chain.get_link_index(name)])
+        # The Jacobian of link 3 does not depend on joints 4 to 7.
+        np.testing.assert_equal(np.zeros((6, 4)), jacs[3][:, 3:])
+        with self.assertRaises(ValueError):
+            chain.jacobian(th, end_only=False, return_pose=True)
+        with self.assertRaises(ValueError):
+            chain.jacobian(th, end_only=False, out=np.zeros((6, 7)))
+        # A link name selects that link, as for Chain.jacobian.
+        np.testing.assert_allclose(jacs[4], chain.jacobian(th, "lbr_iiwa_link_4"))
+        np.testing.assert_allclose(jacs[[4, 6]], chain.jacobian(th, ["lbr_iiwa_link_4", "lbr_iiwa_link_6"]))
+        jac, pose = chain.jacobian(th, "lbr_iiwa_link_4", return_pose=True)
+        np.testing.assert_allclose(chain.forward_kinematics(th, end_only=False)["lbr_iiwa_link_4"].matrix(), pose.matrix())
+        with self.assertRaises(TypeError):
+            chain.jacobian(th, 0)
+
+    def test_jacobian_batch(self):
+        chain = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        ths = np.random.rand(6, 7)
+        jcs, poses = chain.jacobian(ths, return_pose=True)
+        self.assertEqual((6, 6, 7), jcs.shape)
+        self.assertEqual((6,), poses.shape)
+        for th, jc, pose in zip(ths, jcs, poses):
+            np.testing.assert_allclose(chain.jacobian(th), jc, atol=1.0e-12)
+            np.testing.assert_allclose(chain.forward_kinematics(th).matrix(), pose.matrix(), atol=1.0e-12)
+        self.assertEqual((6, 8, 6, 7), chain.link_jacobians(ths).shape)
+
+    def test_jacobian_out(self):
+        chain = kp.build_serial_chain_from_urdf(open("examples/kuka_iiwa/model.urdf").read(), "lbr_iiwa_link_7")
+        jac = np.zeros((6, 7))
+        mats = np.zeros((8, 4, 4))
+        for th in np.random.rand(3, 7):
+            self.assertIs(jac, chain.jacobian(th, out=jac))
+            np.testing.assert_allclose(chain.compile().jacobian(th, 7)[0], jac, atol=1.0e-12)
+            self.assertIs(mats, chain.link_matrices(th, out=mats))
+            np.testing.assert_allclose(chain.forward_kinematics(th).matrix(), mats[-1], atol=1.0e-12)
+        jacs = np.zeros((3, 6, 7))
+        ths = np.random.rand(3, 7)
+        chain.jacobian(ths, out=jacs)
+        np.testing.assert_allclose(chain.jacobian(ths), jacs)
+        # Poses returned with `out` do not share memory with later calls.
+        th1, th2 = np.random.rand(2, 7)
+        pose1 = chain.jacobian(th1, return_pose=True, out=jac)[1]
+        expected = chain.forward_kinematics(th1).matrix()
+        chain.jacobian(th2, return_pose=True, out=jac)
+        np.testing.assert_allclose(expected, pose1.matrix(), atol=1.0e-12)
+
+    def test_tree_jacobian(self):
+        chain = kp.build_chain_from_file("examples/humanoid/humanoid.xml")
+        names = chain.get_joint_parameter_names()
+        th = np.random.rand(len(names))
+        links = ["left_foot", "right_lower_arm"]
+        jacs, poses = chain.jacobian(th, links, return_pose=True)
+        self.assertEqual((2, 6, len(names)), jacs.shape)
+        for jac, pose, link in zip(jacs, poses, links):
+            np.testing.assert_allclose(chain.jacobian(th, link), jac)
+            np.testing.assert_allclose(chain.forward_kinematics(th)[link].matrix(), pose.matrix(), atol=1.0e-12)
+            serial = kp.chain.SerialChain(chain, link + "_frame")
+            serial_names = serial.get_joint_parameter_names()
+            columns = [names.index(name) for name in serial_names]
+            np.testing.assert_allclose(serial.jacobian(th[columns]), jac[:, columns], atol=1.0e-12)
+            np.testing.assert_equal(0.0, np.delete(jac, columns, axis=1))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
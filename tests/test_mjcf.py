@@ -1,6 +1,12 @@
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
 import unittest
 
 import kinpy as kp
+from kinpy.mjcf_parser import schema
 
 
 SIMPLE_MJCF = b"""
@@ -69,6 +75,20 @@ class TestMjcf(unittest.TestCase):
             jaw_chain.get_joint_parameter_names(),
         )
 
+    def test_schema_is_loaded_lazily(self):
+        code = "import kinpy; from kinpy.mjcf_parser import schema; print('MUJOCO' in vars(schema))"
+        self.assertEqual("False", subprocess.check_output([sys.executable, "-c", code], text=True).strip())
+
+    def test_compiled_schema(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "schema.pkl")
+            schema.compile_schema(path)
+            with open(path, "rb") as f:
+                _, spec = pickle.load(f)
+        self.assertEqual(list(schema.MUJOCO.children), list(spec.children))
+        body = spec.children["worldbody"].children["body"]
+        self.assertIs(body, body.children["body"])
+
 
 if __name__ == "__main__":
     unittest.main()
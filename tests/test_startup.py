@@ -0,0 +1,37 @@
+import subprocess
+import sys
+import unittest
+
+# Generous compared to the ~20 ms measured locally, but far below the ~800 ms
+# that importing scipy, the MJCF schema and vtk eagerly used to cost.
+IMPORT_BUDGET = 0.25
+
+HEAVY_MODULES = ["scipy", "vtk", "absl", "lxml", "transformations", "kinpy.mjcf_parser", "kinpy.urdf_parser_py"]
+
+CODE = """
+import sys, time
+t = time.perf_counter()
+import kinpy
+print(time.perf_counter() - t)
+print(" ".join(m for m in %r if m in sys.modules))
+""" % (HEAVY_MODULES,)
+
+
+class TestStartup(unittest.TestCase):
+    def test_import_budget(self):
+        times = []
+        for _ in range(3):
+            out = subprocess.check_output([sys.executable, "-c", CODE], text=True).splitlines()
+            self.assertEqual("", out[1].strip())
+            times.append(float(out[0]))
+        self.assertLess(min(times), IMPORT_BUDGET)
+
+    def test_lazy_attributes(self):
+        code = "import kinpy, sys; kinpy.build_chain_from_urdf; print('kinpy.mjcf_parser' in sys.modules)"
+        self.assertEqual("False", subprocess.check_output([sys.executable, "-c", code], text=True).strip())
+        code = "from kinpy import *; print(Transform().matrix().shape)"
+        self.assertEqual("(4, 4)", subprocess.check_output([sys.executable, "-c", code], text=True).strip())
+
+
+if __name__ == "__main__":
+    unittest.main()
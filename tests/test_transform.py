@@ -15,6 +15,31 @@ class TestTransform(unittest.TestCase):
         self.assertTrue(np.allclose(res.rot, np.array([1.0, 0.0, 0.0, 0.0]), atol=1.0e-6))
         self.assertTrue(np.allclose(res.pos, np.array([0.0, 0.0, 0.0]), atol=1.0e-6))
 
+    def test_batch_matches_single(self):
+        ts = [random_transform() for _ in range(4)]
+        other = random_transform()
+        batch = kp.TransformBatch.from_transforms(ts)
+        self.assertEqual((4,), batch.shape)
+        np.testing.assert_allclose(np.array([t.matrix() for t in ts]), batch.matrix(), atol=1.0e-12)
+        np.testing.assert_allclose(
+            np.array([(t * other).matrix() for t in ts]), (batch * other).matrix(), atol=1.0e-12
+        )
+        np.testing.assert_allclose(
+            np.array([(other * t).matrix() for t in ts]), (other * batch).matrix(), atol=1.0e-12
+        )
+        np.testing.assert_allclose(
+            np.array([t.inverse().matrix() for t in ts]), batch.inverse().matrix(), atol=1.0e-12
+        )
+        np.testing.assert_allclose(np.array([t.rot_euler for t in ts]), batch.rot_euler, atol=1.0e-12)
+        np.testing.assert_allclose(ts[2].matrix(), batch[2].matrix(), atol=1.0e-12)
+        self.assertEqual((2,), batch[1:3].shape)
+
+    def test_batch_multiply(self):
+        batch = kp.TransformBatch.from_transforms([random_transform() for _ in range(3)])
+        res = batch * batch.inverse()
+        self.assertTrue(np.allclose(res.rot, np.array([1.0, 0.0, 0.0, 0.0]), atol=1.0e-6))
+        self.assertTrue(np.allclose(res.pos, np.zeros((3, 3)), atol=1.0e-6))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file